@@ -0,0 +1,325 @@
+"""Async serving mode (see app.yaml): /game-data on the event loop, other routes through Flask."""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from urllib.parse import parse_qs
+from a2wsgi import WSGIMiddleware
+
+from main import (
+    CORS_ORIGIN,
+    GAME_DATA_CACHE,
+    GAME_STORE,
+    LIVE_FEEDS,
+    PIPELINE_EXECUTOR,
+    SCHEDULE_INDEX,
+    STAGE_TIMEOUTS,
+    app as flask_app,
+    SUMMARY_SECTIONS,
+    build_combined_data,
+    parse_fields,
+    render_game_data,
+    fetch_game_stats,
+    game_stats_from_feed,
+    resolve_game,
+    _cache_game_data,
+    _find_stored,
+    _get_stored,
+)
+from functions.sched.sched_data import get_schedule_data_async, list_schedule_games, pull_schedule_data
+from functions.game.feed_parser import fetch_game_data_projected_async
+from functions.game.live_feed import KEEPALIVE_FRAME, KEEPALIVE_INTERVAL, AsyncSubscription, SubscriptionTimeout
+from functions.statsapi.statsapi_async import close_async_client
+from functions.metrics.metrics import REQUEST_DURATION, count, observe_bytes
+from create_files.Article_json import fetch_content_data_async
+from vertex_ai.summary_gen import generate_summaries_async
+
+logger = logging.getLogger(__name__)
+
+# Threads serving the routes that are passed through to the Flask app
+WSGI_WORKERS = int(os.environ.get("MLB_ASGI_WSGI_WORKERS", "10"))
+
+# Builds in progress on this worker's event loop, keyed on gamePk
+_builds = {}
+
+async def _stage_result(awaitable, stage: str, default=None):
+    """Await a pipeline stage within its timeout, returning default on timeout or failure."""
+    try:
+        return await asyncio.wait_for(awaitable, STAGE_TIMEOUTS[stage])
+    except asyncio.TimeoutError:
+        logger.warning("Stage '%s' timed out after %ss", stage, STAGE_TIMEOUTS[stage])
+        count("stage_timeout", stage=stage)
+    except Exception as e:
+        logger.warning("Stage '%s' failed: %s", stage, e)
+        count("stage_error", stage=stage)
+    return default
+
+async def _in_thread(func, *args):
+    """Run a blocking call (SQLite, the live tracker, CPU-bound parsing) on the pipeline pool."""
+    return await asyncio.get_running_loop().run_in_executor(PIPELINE_EXECUTOR, func, *args)
+
+async def fetch_game_stats_async(game_pk: int, game_state: str = None):
+    """Async variant of main.fetch_game_stats."""
+    if game_state == "Live":
+        # LIVE_TRACKER keeps per-game state behind thread locks, so it stays on the pool
+        return await _in_thread(fetch_game_stats, game_pk, game_state)
+    feed = await fetch_game_data_projected_async(game_pk)
+    # Ranking the plays is CPU-bound too
+    return await _in_thread(game_stats_from_feed, game_pk, feed)
+
+async def get_combined_game_data_async(date: str, team_id: int, game_number: int = None,
+                                       summaries: bool = True, content: bool = True) -> dict:
+    """
+    Async counterpart of main.get_combined_game_data, sharing its response cache,
+    game store and schedule index. Payloads built without their summaries or
+    content are neither cached nor stored.
+    """
+    cache_key = (date, team_id, game_number)
+    cached = GAME_DATA_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    games = SCHEDULE_INDEX.lookup(date, team_id) if SCHEDULE_INDEX is not None else None
+    if games is None:
+        stored = await _in_thread(_find_stored, date, team_id, game_number)
+        if stored:
+            combined_data = dict(stored, date=date, your_team_id=team_id)
+            _cache_game_data(cache_key, combined_data)
+            return combined_data
+
+    try:
+        if games is None:
+            schedule_data = await get_schedule_data_async(date, team_id)
+            games = list_schedule_games(schedule_data) if schedule_data else []
+            resolved_from_index = False
+        else:
+            resolved_from_index = True
+        game_pk, schedule_data = resolve_game(date, team_id, game_number, games)
+        if not game_pk:
+            logger.info("No gamePk extracted from schedule data for date: %s and team_id: %s", date, team_id)
+            return None
+
+        stored = await _in_thread(_get_stored, game_pk) if resolved_from_index else None
+        if stored:
+            combined_data = dict(stored, date=date, your_team_id=team_id)
+            _cache_game_data(cache_key, combined_data)
+            return combined_data
+
+        combined_data = await build_game_data_async(date, team_id, game_pk, schedule_data, summaries, content)
+    except Exception as e:
+        logger.exception("Error fetching and combining game data: %s", e)
+        return None
+    if not combined_data or not (summaries and content):
+        return combined_data
+
+    try:
+        await _in_thread(GAME_STORE.put, combined_data)
+    except sqlite3.Error as e:
+        logger.warning("Error writing game store: %s", e)
+    _cache_game_data(cache_key, combined_data)
+    return combined_data
+
+async def build_game_data_async(date: str, team_id: int, game_pk: int, schedule_data: dict,
+                                summaries: bool = True, content: bool = True) -> dict:
+    """
+    Build the payload for a game, sharing one build between concurrent requests
+    for the same gamePk (and stages). Returns None on failure.
+    """
+    key = (game_pk, summaries, content)
+    build = _builds.get(key)
+    if build is None:
+        build = asyncio.ensure_future(_build_game_data_async(date, team_id, game_pk, schedule_data,
+                                                             summaries, content))
+        _builds[key] = build
+        build.add_done_callback(lambda _: _builds.pop(key, None))
+    # A requester that disconnects must not cancel a build other requests are waiting on
+    game_data = await asyncio.shield(build)
+    if not game_data:
+        return None
+    return dict(game_data, date=date, your_team_id=team_id)
+
+async def _build_game_data_async(date: str, team_id: int, game_pk: int, schedule_data: dict,
+                                 summaries: bool = True, content: bool = True) -> dict:
+    """
+    Same stages as main._build_game_data_concurrent, run as tasks on the event loop.
+    The content fetch and the summaries are skipped when not requested (None).
+    """
+    try:
+        game_info = pull_schedule_data(schedule_data)
+        stats_task = asyncio.ensure_future(fetch_game_stats_async(game_pk, game_info.get("game_state")))
+        content_task = asyncio.ensure_future(fetch_content_data_async(game_pk)) if content else None
+
+        game_stats = await _stage_result(stats_task, "game_feed")
+        if not game_stats:
+            if content_task is not None:
+                content_task.cancel()
+            return None
+        game_details, line_score, highlights = game_stats
+
+        combined_data = build_combined_data(date, team_id, game_pk, game_info,
+                                            game_details, line_score, highlights, None)
+
+        summaries_task = asyncio.ensure_future(generate_summaries_async(combined_data)) if summaries else None
+
+        if content_task is not None:
+            combined_data["content_data"] = await _stage_result(content_task, "content", default={})
+        generated = await _stage_result(summaries_task, "summary", default={}) if summaries else {}
+        combined_data["detailed_summary"] = generated.get("detailed_summary")
+        combined_data["concise_summary"] = generated.get("concise_summary")
+
+        return combined_data
+    except Exception as e:
+        logger.exception("Error fetching and combining game data: %s", e)
+        return None
+
+def _header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+def _cors_headers(scope, status: int) -> list:
+    """
+    The CORS headers the Flask app sends on /game-data: the view sets the origin on
+    success, and flask-cors adds its headers to error responses for the allowed
+    (or a missing) Origin.
+    """
+    if status == 200:
+        return [(b"access-control-allow-origin", CORS_ORIGIN.encode())]
+    origin = _header(scope, b"origin")
+    if origin is not None and origin != CORS_ORIGIN:
+        return []
+    return [
+        (b"access-control-allow-origin", CORS_ORIGIN.encode()),
+        (b"access-control-expose-headers", b"Content-Type"),
+        (b"access-control-allow-credentials", b"true"),
+    ]
+
+def _encode_json(data) -> bytes:
+    # Same encoding as Flask's jsonify
+    return (json.dumps(data, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+async def _send_json(scope, send, data, status: int = 200):
+    body = _encode_json(data)
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ] + _cors_headers(scope, status)
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+    observe_bytes("response", len(body))
+
+async def _send_game_data(scope, send, combined_data: dict, sections: frozenset = None):
+    """Send a payload as main.render_game_data renders it (projected, compressed, or a 304)."""
+    status, headers, body = render_game_data(combined_data, sections,
+                                             _header(scope, b"accept-encoding"),
+                                             _header(scope, b"if-none-match"))
+    headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    if status == 200:
+        headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers + _cors_headers(scope, 200)})
+    await send({"type": "http.response.body", "body": body})
+    observe_bytes("response", len(body))
+
+async def game_data_endpoint(scope, receive, send):
+    """GET /game-data, with the same parameters and responses as the Flask view."""
+    params = parse_qs(scope["query_string"].decode("latin-1"))
+    date = params.get("date", [None])[0]
+    team_id = params.get("team_id", [None])[0]
+    game_number = params.get("game_number", [None])[0]
+
+    if not date or not team_id:
+        return await _send_json(scope, send, {"error": "Please select a date and team first"}, 400)
+
+    try:
+        sections = parse_fields(params.get("fields", [None])[0])
+    except ValueError as e:
+        return await _send_json(scope, send, {"error": str(e)}, 400)
+
+    try:
+        combined_data = await get_combined_game_data_async(
+            date, int(team_id),
+            game_number=int(game_number) if game_number else None,
+            summaries=sections is None or bool(sections & SUMMARY_SECTIONS),
+            content=sections is None or "content_data" in sections,
+        )
+    except Exception as e:
+        logger.exception("Error processing game data: %s", e)
+        return await _send_json(scope, send, {"error": str(e)}, 500)
+
+    if not combined_data:
+        return await _send_json(scope, send, {"error": "No game data found"}, 404)
+    await _send_game_data(scope, send, combined_data, sections)
+
+async def _wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+async def game_data_live_endpoint(scope, receive, send):
+    """GET /game-data/live: the Flask view's event stream, without a thread per viewer."""
+    game_pk = parse_qs(scope["query_string"].decode("latin-1")).get("game_pk", [""])[0]
+    if not game_pk.isdigit():
+        return await _send_json(scope, send, {"error": "Please provide a numeric game_pk"}, 400)
+
+    subscription = LIVE_FEEDS.subscribe(int(game_pk), AsyncSubscription(int(game_pk)))
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    # Closing the subscription wakes the loop below as soon as the client goes away
+    disconnected.add_done_callback(lambda _: subscription.close())
+    try:
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+        ] + _cors_headers(scope, 200)})
+        while not disconnected.done():
+            try:
+                frame = await subscription.get_async(KEEPALIVE_INTERVAL)
+            except SubscriptionTimeout:
+                frame = KEEPALIVE_FRAME
+            if frame is None:
+                break
+            await send({"type": "http.response.body", "body": frame, "more_body": True})
+        if not disconnected.done():
+            await send({"type": "http.response.body", "body": b""})
+    finally:
+        disconnected.cancel()
+        LIVE_FEEDS.unsubscribe(subscription)
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+_wsgi_app = WSGIMiddleware(flask_app, workers=WSGI_WORKERS)
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] == "http" and scope["path"] == "/game-data" and scope["method"] == "GET" \
+            and b"summaries=async" not in scope["query_string"]:
+        started = time.perf_counter()
+        status = {}
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await game_data_endpoint(scope, receive, send_and_record)
+        finally:
+            REQUEST_DURATION.observe(time.perf_counter() - started, route="/game-data",
+                                     status=status.get("code", 500))
+        return
+    if scope["type"] == "http" and scope["path"] == "/game-data/live" and scope["method"] == "GET":
+        return await game_data_live_endpoint(scope, receive, send)
+    # Preflight requests, summaries=async (which only waits on the stats fetches)
+    # and every other route keep their Flask behavior
+    await _wsgi_app(scope, receive, send)
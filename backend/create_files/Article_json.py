@@ -1,13 +1,29 @@
-import requests
+from functions.statsapi.statsapi_client import statsapi_get
+from functions.statsapi.statsapi_async import async_statsapi_get
+from functions.metrics.metrics import span
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 def fetch_content_data(game_pk: int) -> dict:
     """
     Given a gamePk, fetch content data (videos, highlights) from the MLB API.
     """
-    api_url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/content"
-    response = requests.get(api_url)
-    if response.status_code == 200:
+    with span("content_fetch", game_pk=game_pk):
+        response = statsapi_get(f"/api/v1/game/{game_pk}/content")
+    return _content_from_response(game_pk, response)
+
+async def fetch_content_data_async(game_pk: int) -> dict:
+    """
+    Async variant of fetch_content_data.
+    """
+    with span("content_fetch", game_pk=game_pk):
+        response = await async_statsapi_get(f"/api/v1/game/{game_pk}/content")
+    return _content_from_response(game_pk, response)
+
+def _content_from_response(game_pk: int, response) -> dict:
+    if response is not None and response.status_code == 200:
         content_data = response.json()
         articles = content_data.get("editorial", {}).get("recap", {}).get("mlb", {})
         headlines = []
@@ -57,7 +73,7 @@ def fetch_content_data(game_pk: int) -> dict:
             "closest_video_description": video_description
         }
     else:
-        print(f"Error fetching content data for gamePk {game_pk}: {response.status_code}")
+        logger.warning("Error fetching content data for gamePk %s: %s", game_pk, getattr(response, "status_code", None))
         return {}
 
 def main():
@@ -0,0 +1,119 @@
+"""Precompute game payloads into the game store; games already complete there are skipped."""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date as date_type, datetime, timedelta
+
+# The Flask app warms Vertex AI at import; do it here once the run actually starts
+os.environ.setdefault("MLB_WARMUP", "0")
+
+from functions.sched.sched_data import get_schedule_range, schedule_data_for_game
+from functions.store.game_store import GameStore
+from main import PLAYER_INDEX, build_game_data, validate_date
+from vertex_ai.summary_gen import warm_up_model
+
+# Seconds to wait at the end of a run for the player highlight index to be written
+PLAYER_INDEX_FLUSH_TIMEOUT = float(os.environ.get("MLB_PLAYER_INDEX_FLUSH_TIMEOUT", "120"))
+
+def iter_schedule_games(schedule_data: dict, team_ids: set = None):
+    """Yield (date, schedule_game) for every game in the schedule, optionally filtered by team."""
+    for date_info in schedule_data.get("dates", []):
+        for game in date_info.get("games", []):
+            if team_ids:
+                home_id = game["teams"]["home"]["team"]["id"]
+                away_id = game["teams"]["away"]["team"]["id"]
+                if home_id not in team_ids and away_id not in team_ids:
+                    continue
+            yield date_info["date"], game
+
+def is_complete(store: GameStore, game_pk: int) -> bool:
+    """A stored game is complete once it is final with both summaries and its content."""
+    status = store.get_status(game_pk)
+    return bool(status) and status["game_state"] == "Final" and status["complete"]
+
+def backfill_game(date: str, game: dict, store: GameStore):
+    """Build one game. Returns (outcome, combined_data) with outcome "built", "skipped" or "failed"."""
+    game_pk = game["gamePk"]
+    if is_complete(store, game_pk):
+        return "skipped", None
+    schedule_data = schedule_data_for_game(date, game)
+    team_id = game["teams"]["home"]["team"]["id"]
+    combined_data = build_game_data(date, team_id, game_pk, schedule_data)
+    if not combined_data:
+        return "failed", None
+    return "built", combined_data
+
+def run_backfill(start_date: str, end_date: str, team_ids: set = None, store: GameStore = None,
+                 workers: int = 4, include_unfinished: bool = False, batch_size: int = 25) -> dict:
+    """
+    Build every game in the range with at most `workers` games in flight, which
+    bounds concurrent statsapi and Vertex AI traffic. Built games are inserted in
+    batches of batch_size. Returns counts per outcome.
+    """
+    store = store or GameStore()
+    schedule_data = get_schedule_range(start_date, end_date)
+    games = [
+        (date, game) for date, game in iter_schedule_games(schedule_data, team_ids)
+        if include_unfinished or game.get("status", {}).get("abstractGameState") == "Final"
+    ]
+    print(f"Backfilling {len(games)} games from {start_date} to {end_date} with {workers} workers")
+
+    counts = {"built": 0, "skipped": 0, "failed": 0}
+    pending = []
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(backfill_game, date, game, store): (date, game["gamePk"]) for date, game in games}
+        for future in as_completed(futures):
+            date, game_pk = futures[future]
+            try:
+                outcome, combined_data = future.result()
+            except Exception as e:
+                print(f"Error backfilling game {game_pk} on {date}: {str(e)}")
+                outcome, combined_data = "failed", None
+            if combined_data:
+                pending.append(combined_data)
+                if len(pending) >= batch_size:
+                    store.put_many(pending)
+                    pending = []
+            counts[outcome] += 1
+            print(f"[{sum(counts.values())}/{len(games)}] {date} {game_pk}: {outcome}")
+    store.put_many(pending)
+    # Built games were queued for the player highlight index; write them before exiting
+    if not PLAYER_INDEX.flush(timeout=PLAYER_INDEX_FLUSH_TIMEOUT):
+        print(f"Player index not written within {PLAYER_INDEX_FLUSH_TIMEOUT:.0f}s; some games may be missing from it")
+    print(f"Backfill finished in {time.monotonic() - started:.1f}s: {counts}")
+    return counts
+
+def parse_args(argv=None):
+    yesterday = (date_type.today() - timedelta(days=1)).isoformat()
+    parser = argparse.ArgumentParser(description="Precompute combined game payloads for a date range.")
+    parser.add_argument("--start", default=yesterday, help="First date (YYYY-MM-DD), default yesterday")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD), default same as --start")
+    parser.add_argument("--teams", help="Comma-separated team IDs to limit the run to")
+    parser.add_argument("--workers", type=int, default=4, help="Games built in parallel (default 4)")
+    parser.add_argument("--store", help="Game store path (default MLB_GAME_STORE_PATH or mlb_games.sqlite3 in the temp dir)")
+    parser.add_argument("--batch-size", type=int, default=25, help="Games per bulk insert (default 25)")
+    parser.add_argument("--include-unfinished", action="store_true",
+                        help="Also build games that are not final yet")
+    args = parser.parse_args(argv)
+    args.end = args.end or args.start
+    for value in (args.start, args.end):
+        if not validate_date(value):
+            parser.error(f"Invalid date format: {value}. Please use YYYY-MM-DD format.")
+    if datetime.strptime(args.end, "%Y-%m-%d") < datetime.strptime(args.start, "%Y-%m-%d"):
+        parser.error("--end must not be before --start")
+    try:
+        args.teams = {int(team) for team in args.teams.split(",")} if args.teams else None
+    except ValueError:
+        parser.error("Invalid team ID. Please use comma-separated numbers.")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    warm_up_model()
+    run_backfill(args.start, args.end, args.teams, GameStore(args.store), args.workers,
+                 args.include_unfinished, args.batch_size)
+
+if __name__ == "__main__":
+    main()
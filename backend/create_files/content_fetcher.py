@@ -1,13 +1,17 @@
-import requests
+from functions.statsapi.statsapi_client import statsapi_get
+from functions.metrics.metrics import span
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 def fetch_content_data(game_pk: int) -> dict:
     """
     Given a gamePk, fetch content data (videos, highlights) from the MLB API.
     """
-    api_url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/content"
-    response = requests.get(api_url)
-    if response.status_code == 200:
+    with span("content_fetch", game_pk=game_pk):
+        response = statsapi_get(f"/api/v1/game/{game_pk}/content")
+    if response is not None and response.status_code == 200:
         content_data = response.json()
         articles = content_data.get("editorial", {}).get("recap", {}).get("mlb", {})
         headlines = []
@@ -56,5 +60,5 @@ def fetch_content_data(game_pk: int) -> dict:
             "closest_video_description": video_description
         }
     else:
-        print(f"Error fetching content data for gamePk {game_pk}: {response.status_code}")
+        logger.warning("Error fetching content data for gamePk %s: %s", game_pk, getattr(response, "status_code", None))
         return {}
\ No newline at end of file
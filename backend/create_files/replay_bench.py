@@ -0,0 +1,56 @@
+"""Benchmark get_combined_game_data offline against recorded upstream fixtures."""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+# Record the fixtures once with MLB_UPSTREAM_MODE=record, then replay them with
+# MLB_REPLAY_LATENCY_MS / MLB_REPLAY_LLM_LATENCY_MS set to mimic upstream latency
+os.environ.setdefault("MLB_UPSTREAM_MODE", "replay")
+os.environ.setdefault("MLB_SCHEDULE_INDEX", "0")
+os.environ.setdefault("MLB_WARMUP", "0")
+
+import main
+import vertex_ai.summary_cache as summary_cache
+from functions.store.game_store import GameStore
+
+def reset_caches(scratch_dir: str, iteration: int):
+    """Point every cache layer at empty storage so the full pipeline runs."""
+    main.GAME_DATA_CACHE.clear()
+    main.GAME_STORE = GameStore(os.path.join(scratch_dir, f"games-{iteration}.sqlite3"),
+                                stale_after=main.GAME_STORE.stale_after)
+    summary_cache._default_cache = summary_cache.SummaryCache(os.path.join(scratch_dir, f"summaries-{iteration}.sqlite3"))
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the /game-data pipeline against recorded fixtures.")
+    parser.add_argument("--date", required=True, help="Game date (YYYY-MM-DD)")
+    parser.add_argument("--teams", required=True, help="Comma-separated team IDs")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warm", action="store_true", help="Keep caches between iterations")
+    args = parser.parse_args(argv)
+    team_ids = [int(team) for team in args.teams.split(",")]
+
+    print(f"Upstream mode: {os.environ['MLB_UPSTREAM_MODE']}")
+    scratch_dir = tempfile.mkdtemp(prefix="mlb-bench-")
+    timings = {team_id: [] for team_id in team_ids}
+    for iteration in range(args.iterations):
+        if not args.warm:
+            reset_caches(scratch_dir, iteration)
+        for team_id in team_ids:
+            started = time.perf_counter()
+            combined_data = main.get_combined_game_data(args.date, team_id)
+            timings[team_id].append((time.perf_counter() - started) * 1000)
+            if not combined_data:
+                print(f"Iteration {iteration}: no game data for team {team_id}")
+
+    for team_id, values in timings.items():
+        print(f"team {team_id}: n={len(values)} mean={statistics.mean(values):.1f}ms "
+              f"p50={percentile(values, 50):.1f}ms p95={percentile(values, 95):.1f}ms max={max(values):.1f}ms")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,94 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+import orjson
+
+try:
+    import brotli
+except ImportError:  # Without the brotli package only gzip is offered
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = int(os.environ.get("MLB_MIN_COMPRESS_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("MLB_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("MLB_BROTLI_QUALITY", "5"))
+
+# Compressed bodies kept per (etag, encoding), so repeat loads aren't recompressed
+COMPRESSED_CACHE_BYTES = int(os.environ.get("MLB_COMPRESSED_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+def encode_json(data) -> bytes:
+    """Serialize a payload to compact UTF-8 JSON with orjson."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+def sse_event(event: str, data, event_id: int = None) -> bytes:
+    """Encode one server-sent event with a JSON data line."""
+    frame = b"event: " + event.encode() + b"\n"
+    if event_id is not None:
+        frame += b"id: " + str(event_id).encode() + b"\n"
+    return frame + b"data: " + encode_json(data) + b"\n\n"
+
+def supported_encodings() -> tuple:
+    """Content codings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: str, size: int):
+    """
+    Pick the content coding for a body of `size` bytes from an Accept-Encoding header:
+    brotli, then gzip, among those the client accepts with a non-zero q-value.
+    Returns None (identity) for small bodies or when nothing matches.
+    """
+    if not accept_encoding or size < MIN_COMPRESS_BYTES:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in supported_encodings():
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (etag, encoding), bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def compress(self, etag: str, body: bytes, encoding: str) -> bytes:
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+        compressed = compress(body, encoding)
+        if len(compressed) > self.max_bytes:
+            return compressed
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self._bytes += len(compressed)
+                while self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= len(old)
+        return compressed
+
+COMPRESSED_BODIES = CompressedBodyCache(COMPRESSED_CACHE_BYTES)
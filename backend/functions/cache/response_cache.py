@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Default time-to-live in seconds by abstractGameState; None means keep until evicted
+DEFAULT_TTLS = {
+    "Final": None,
+    "Live": 30,
+    "Preview": 300,
+}
+
+class ResponseCache:
+    """
+    In-process LRU cache for combined game payloads.
+
+    Entries expire according to the game state they were stored with (final games
+    never expire, live and preview games get a short TTL) and the cache is bounded
+    by both an entry count and an approximate byte budget. Cached values are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, ttls: dict = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, game_state: str = None, ttl: float = None):
+        """
+        Store value under key. The TTL comes from game_state unless given explicitly;
+        unknown states fall back to the shortest configured TTL, or never expire if
+        no state has one.
+        """
+        if ttl is None:
+            if game_state in self.ttls:
+                ttl = self.ttls[game_state]
+            else:
+                ttl = min((t for t in self.ttls.values() if t is not None), default=None)
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a single entry if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,243 @@
+import asyncio
+import io
+import logging
+import os
+import ijson
+import orjson
+from functions.statsapi.statsapi_client import statsapi_get
+from functions.statsapi.statsapi_async import async_statsapi_get
+from functions.metrics.metrics import span, observe_bytes
+
+logger = logging.getLogger(__name__)
+
+# Feeds up to this many (decoded) bytes are loaded whole with orjson and then
+# projected, which is several times faster than streaming them token by token.
+# Larger feeds are streamed so their peak memory stays flat.
+FEED_STREAM_THRESHOLD = int(os.environ.get("MLB_FEED_STREAM_THRESHOLD", str(2 * 1024 * 1024)))
+
+# Fields pulled from the live feed. Everything else in the document is dropped,
+# and a streamed feed is never materialized in memory.
+SUBTREE_FIELDS = {
+    "metaData.timeStamp": ("metaData", "timeStamp"),
+    "gameData.status.abstractGameState": ("gameData", "status", "abstractGameState"),
+    "gameData.datetime.originalDate": ("gameData", "datetime", "originalDate"),
+    "gameData.datetime.time": ("gameData", "datetime", "time"),
+    "gameData.datetime.dayNight": ("gameData", "datetime", "dayNight"),
+    "gameData.venue.name": ("gameData", "venue", "name"),
+    "gameData.venue.id": ("gameData", "venue", "id"),
+    "gameData.teams.home.name": ("gameData", "teams", "home", "name"),
+    "gameData.teams.home.id": ("gameData", "teams", "home", "id"),
+    "gameData.teams.away.name": ("gameData", "teams", "away", "name"),
+    "gameData.teams.away.id": ("gameData", "teams", "away", "id"),
+    "gameData.probablePitchers": ("gameData", "probablePitchers"),
+    "liveData.linescore": ("liveData", "linescore"),
+}
+
+PLAY_PREFIX = "liveData.plays.allPlays.item"
+
+# Fields kept for each play in allPlays, relative to the play object
+PLAY_FIELDS = {
+    "result.eventType": ("result", "eventType"),
+    "result.rbi": ("result", "rbi"),
+    "result.description": ("result", "description"),
+    "about.inning": ("about", "inning"),
+    "about.isTopInning": ("about", "isTopInning"),
+    "about.isScoringPlay": ("about", "isScoringPlay"),
+    "about.captivatingIndex": ("about", "captivatingIndex"),
+    "about.isComplete": ("about", "isComplete"),
+    "matchup.batter.id": ("matchup", "batter", "id"),
+    "matchup.batter.fullName": ("matchup", "batter", "fullName"),
+    "matchup.pitcher.id": ("matchup", "pitcher", "id"),
+    "matchup.pitcher.fullName": ("matchup", "pitcher", "fullName"),
+}
+PLAY_FIELD_PREFIXES = {f"{PLAY_PREFIX}.{field}": path for field, path in PLAY_FIELDS.items()}
+PLAY_EVENT_ID_PREFIX = f"{PLAY_PREFIX}.playEvents.item.playId"
+
+SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+def _set_path(target: dict, path: tuple, value):
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    target[path[-1]] = value
+
+_MISSING = object()
+
+def _get_path(source, path: tuple):
+    for key in path:
+        if not isinstance(source, dict) or key not in source:
+            return _MISSING
+        source = source[key]
+    return source
+
+def project_game_feed(document: dict) -> dict:
+    """
+    Reduce an already loaded feed/live document to the same projection that
+    parse_game_feed produces while streaming.
+    """
+    feed = {
+        "gameData": {"probablePitchers": {}},
+        "liveData": {"plays": {"allPlays": []}},
+    }
+    for path in SUBTREE_FIELDS.values():
+        value = _get_path(document, path)
+        if value is not _MISSING:
+            _set_path(feed, path, value)
+    plays = feed["liveData"]["plays"]["allPlays"]
+    for source in _get_path(document, ("liveData", "plays", "allPlays")) or ():
+        play = {}
+        for path in PLAY_FIELDS.values():
+            value = _get_path(source, path)
+            if value is not _MISSING:
+                _set_path(play, path, value)
+        play_id = None
+        for event in source.get("playEvents") or ():
+            if "playId" in event:
+                play_id = event["playId"]
+        play["playEvents"] = [{"playId": play_id}] if play_id is not None else []
+        plays.append(play)
+    return feed
+
+def load_game_feed(data: bytes) -> dict:
+    """
+    Parse a complete feed/live body with orjson and project it (see project_game_feed).
+    """
+    return project_game_feed(orjson.loads(data))
+
+class _PrefixedStream:
+    """File-like reader that returns an already read prefix before the rest of a stream."""
+
+    def __init__(self, prefix: bytes, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self._prefix:
+            if size < 0 or size >= len(self._prefix):
+                chunk, self._prefix = self._prefix, b""
+            else:
+                chunk, self._prefix = self._prefix[:size], self._prefix[size:]
+            return chunk
+        return self._stream.read(size)
+
+def _read_up_to(stream, limit: int) -> bytes:
+    chunks = []
+    remaining = limit
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+def parse_game_feed(stream) -> dict:
+    """
+    Parse a feed/live document from a file-like byte stream, keeping only the fields
+    the report uses. The result has the same shape as the upstream document (with
+    each play's playEvents reduced to its last playId), so get_detailed_data,
+    line_score_report and filter_and_rank_highlights work on it unchanged.
+    """
+    feed = {
+        "gameData": {"probablePitchers": {}},
+        "liveData": {"plays": {"allPlays": []}},
+    }
+    plays = feed["liveData"]["plays"]["allPlays"]
+    builder = None
+    builder_path = None
+    depth = 0
+    play = None
+    play_id = None
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    _set_path(feed, builder_path, builder.value)
+                    builder = None
+            continue
+
+        if play is not None:
+            if prefix == PLAY_PREFIX and event == "end_map":
+                play["playEvents"] = [{"playId": play_id}] if play_id is not None else []
+                plays.append(play)
+                play = None
+            elif event in SCALAR_EVENTS:
+                if prefix == PLAY_EVENT_ID_PREFIX:
+                    play_id = value
+                else:
+                    path = PLAY_FIELD_PREFIXES.get(prefix)
+                    if path is not None:
+                        _set_path(play, path, value)
+            continue
+
+        if prefix == PLAY_PREFIX and event == "start_map":
+            play = {}
+            play_id = None
+            continue
+
+        path = SUBTREE_FIELDS.get(prefix)
+        if path is None:
+            continue
+        if event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            builder_path = path
+            depth = 1
+        elif event in SCALAR_EVENTS:
+            _set_path(feed, path, value)
+
+    return feed
+
+def fetch_game_data_projected(game_pk: int) -> dict:
+    """
+    Given a gamePk, stream the live feed from the MLB API and return only the
+    projected fields (see parse_game_feed). Returns {} on failure, like fetch_game_data.
+    """
+    with span("feed_fetch", game_pk=game_pk):
+        response = statsapi_get(f"/api/v1.1/game/{game_pk}/feed/live", stream=True)
+    if response is None or response.status_code != 200:
+        logger.warning("Error fetching game data for gamePk %s: %s", game_pk, getattr(response, "status_code", None))
+        if response is not None:
+            response.close()
+        return {}
+    try:
+        # Let urllib3 undo gzip/deflate as the parser pulls bytes off the socket
+        response.raw.decode_content = True
+        observe_bytes("feed", response.headers.get("Content-Length"))
+        with span("feed_parse", game_pk=game_pk):
+            head = _read_up_to(response.raw, FEED_STREAM_THRESHOLD + 1)
+            if len(head) <= FEED_STREAM_THRESHOLD:
+                return load_game_feed(head)
+            return parse_game_feed(_PrefixedStream(head, response.raw))
+    except (ijson.JSONError, ValueError) as e:
+        logger.warning("Error parsing game data for gamePk %s: %s", game_pk, e)
+        return {}
+    finally:
+        response.close()
+
+async def fetch_game_data_projected_async(game_pk: int) -> dict:
+    """
+    Async variant of fetch_game_data_projected. The body is read without blocking
+    the event loop and then parsed and projected on a worker thread, since parsing
+    is CPU-bound.
+    """
+    with span("feed_fetch", game_pk=game_pk):
+        response = await async_statsapi_get(f"/api/v1.1/game/{game_pk}/feed/live")
+    if response is None or response.status_code != 200:
+        logger.warning("Error fetching game data for gamePk %s: %s", game_pk, getattr(response, "status_code", None))
+        return {}
+    observe_bytes("feed", len(response.content))
+    if len(response.content) <= FEED_STREAM_THRESHOLD:
+        parse, body = load_game_feed, response.content
+    else:
+        parse, body = parse_game_feed, io.BytesIO(response.content)
+    try:
+        with span("feed_parse", game_pk=game_pk):
+            return await asyncio.get_running_loop().run_in_executor(None, parse, body)
+    except (ijson.JSONError, ValueError) as e:
+        logger.warning("Error parsing game data for gamePk %s: %s", game_pk, e)
+        return {}
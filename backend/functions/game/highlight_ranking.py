@@ -0,0 +1,93 @@
+import heapq
+from array import array
+from functions.game.records import PlayRecord
+
+# Base score by (lower-cased) eventType; anything not listed scores DEFAULT_EVENT_SCORE
+EVENT_TYPE_SCORES = {
+    "home_run": 5,
+    "triple": 4,
+    "double": 4,
+    "double_play": 4,
+    "strikeout": 3,
+    "walk": 3,
+    "stolen_base": 3,
+}
+DEFAULT_EVENT_SCORE = 1
+
+# Bonuses added on top of the event score
+RBI_BONUS = 1
+SCORING_PLAY_BONUS = 2
+CAPTIVATING_BONUS = 1
+CAPTIVATING_THRESHOLD = 50
+
+# Event code 0 is reserved for unlisted event types
+EVENT_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPE_SCORES, start=1)}
+CODE_SCORES = array("b", [DEFAULT_EVENT_SCORE] + list(EVENT_TYPE_SCORES.values()))
+
+class PlayColumns:
+    """
+    Columnar view of a list of plays: one compact array per field used for scoring.
+    The plays themselves are only referenced, never copied or modified.
+    """
+    __slots__ = ("plays", "event_code", "rbi", "is_scoring", "captivating")
+
+    def __init__(self, plays: list):
+        self.plays = plays
+        self.event_code = array("B")
+        self.rbi = array("b")
+        self.is_scoring = array("b")
+        self.captivating = array("d")
+        for play in plays:
+            result = play.get("result", {})
+            about = play.get("about", {})
+            self.event_code.append(EVENT_CODES.get(result.get("eventType", "").lower(), 0))
+            self.rbi.append(1 if result.get("rbi", 0) > 0 else 0)
+            self.is_scoring.append(1 if about.get("isScoringPlay", False) else 0)
+            self.captivating.append(about.get("captivatingIndex", 0))
+
+    def __len__(self):
+        return len(self.plays)
+
+    def scores(self) -> array:
+        """Score every play in one pass over the columns (same rules as rank_play)."""
+        return array("b", [
+            CODE_SCORES[code] + RBI_BONUS * rbi + SCORING_PLAY_BONUS * scoring
+            + (CAPTIVATING_BONUS if captivating > CAPTIVATING_THRESHOLD else 0)
+            for code, rbi, scoring, captivating
+            in zip(self.event_code, self.rbi, self.is_scoring, self.captivating)
+        ])
+
+def score_event_type(event_type: str) -> int:
+    """Base score for an eventType, from the weight table."""
+    return EVENT_TYPE_SCORES.get(event_type.lower(), DEFAULT_EVENT_SCORE)
+
+def _top_k_indices(scores, k: int, min_score: int) -> list:
+    # Highest score first; ties keep play order, exactly like a stable descending sort
+    candidates = (i for i, score in enumerate(scores) if score >= min_score)
+    if k is None:
+        return sorted(candidates, key=lambda i: (-scores[i], i))
+    return heapq.nlargest(k, candidates, key=lambda i: (scores[i], -i))
+
+def top_k_highlights(plays: list, k: int = 5, min_score: int = 3) -> list:
+    """
+    Return the k best highlights from plays as PlayRecords in O(n log k).
+    Serialized, the result equals filter_and_rank_highlights(plays, min_score)[:k],
+    but only the selected plays become records and the plays are left untouched.
+    Pass k=None to rank every play at or above min_score.
+    """
+    columns = PlayColumns(plays)
+    scores = columns.scores()
+    return [PlayRecord.from_play(plays[i], scores[i]) for i in _top_k_indices(scores, k, min_score)]
+
+def top_k_highlights_across_games(plays_by_game: dict, k: int = 5, min_score: int = 3) -> list:
+    """
+    Rank plays from many games at once and return the overall top k as
+    (game_pk, PlayRecord) pairs. Ties are broken by game order, then play order.
+    """
+    plays = []
+    game_pks = []
+    for game_pk, game_plays in plays_by_game.items():
+        plays.extend(game_plays)
+        game_pks.extend([game_pk] * len(game_plays))
+    scores = PlayColumns(plays).scores()
+    return [(game_pks[i], PlayRecord.from_play(plays[i], scores[i])) for i in _top_k_indices(scores, k, min_score)]
@@ -0,0 +1,100 @@
+import copy
+
+class JsonPatchError(Exception):
+    """Raised when a patch operation can't be applied to the document."""
+
+def _parse_pointer(pointer: str) -> list:
+    """Split an RFC 6901 JSON pointer into unescaped path tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+def _container_index(container, token, allow_end=False):
+    if isinstance(container, list):
+        if token == "-" and allow_end:
+            return len(container)
+        try:
+            index = int(token)
+        except ValueError:
+            raise JsonPatchError(f"Invalid list index: {token}")
+        limit = len(container) if allow_end else len(container) - 1
+        if index < 0 or index > limit:
+            raise JsonPatchError(f"List index out of range: {token}")
+        return index
+    if isinstance(container, dict):
+        return token
+    raise JsonPatchError(f"Cannot index into {type(container).__name__}")
+
+def _resolve_parent(doc, tokens):
+    target = doc
+    for token in tokens[:-1]:
+        try:
+            target = target[_container_index(target, token)]
+        except (KeyError, IndexError):
+            raise JsonPatchError(f"Path not found at token: {token}")
+    return target
+
+def _get(doc, pointer):
+    target = doc
+    for token in _parse_pointer(pointer):
+        try:
+            target = target[_container_index(target, token)]
+        except (KeyError, IndexError):
+            raise JsonPatchError(f"Path not found: {pointer}")
+    return target
+
+def _add(doc, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve_parent(doc, tokens)
+    key = _container_index(parent, tokens[-1], allow_end=True)
+    if isinstance(parent, list):
+        parent.insert(key, value)
+    else:
+        parent[key] = value
+    return doc
+
+def _remove(doc, tokens):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve_parent(doc, tokens)
+    key = _container_index(parent, tokens[-1])
+    try:
+        return parent.pop(key)
+    except KeyError:
+        raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+def apply_patch(doc, operations):
+    """
+    Apply a list of RFC 6902 JSON patch operations to doc in place.
+    Returns the patched document (a new object only when the root is replaced).
+    """
+    for op in operations:
+        name = op.get("op")
+        tokens = _parse_pointer(op.get("path", ""))
+        if name == "add":
+            doc = _add(doc, tokens, op.get("value"))
+        elif name == "remove":
+            _remove(doc, tokens)
+        elif name == "replace":
+            if not tokens:
+                doc = op.get("value")
+                continue
+            parent = _resolve_parent(doc, tokens)
+            key = _container_index(parent, tokens[-1])
+            if isinstance(parent, dict) and key not in parent:
+                raise JsonPatchError(f"Path not found: {op.get('path')}")
+            parent[key] = op.get("value")
+        elif name == "move":
+            value = _remove(doc, _parse_pointer(op["from"]))
+            doc = _add(doc, tokens, value)
+        elif name == "copy":
+            doc = _add(doc, tokens, copy.deepcopy(_get(doc, op["from"])))
+        elif name == "test":
+            if _get(doc, op.get("path", "")) != op.get("value"):
+                raise JsonPatchError(f"Test failed at {op.get('path')}")
+        else:
+            raise JsonPatchError(f"Unsupported patch operation: {name}")
+    return doc
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from functions.api.encoding import sse_event
+from functions.metrics.metrics import count
+
+logger = logging.getLogger(__name__)
+
+# Seconds between upstream polls of a game that has at least one subscriber
+POLL_INTERVAL = float(os.environ.get("MLB_LIVE_POLL_INTERVAL", "10"))
+
+# Seconds of silence after which a subscriber is sent a keep-alive comment
+KEEPALIVE_INTERVAL = float(os.environ.get("MLB_LIVE_KEEPALIVE", "15"))
+
+# Events buffered per subscriber; a subscriber that falls this far behind is disconnected
+SUBSCRIBER_BUFFER = int(os.environ.get("MLB_LIVE_SUBSCRIBER_BUFFER", "32"))
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+class SubscriptionTimeout(Exception):
+    """No event arrived within the requested timeout."""
+
+class Subscription:
+    """
+    One subscriber's queue of encoded SSE frames; get() returns None once the feed
+    has ended. Delivery never blocks the poller: a subscriber whose buffer is full
+    is closed, and reconnecting (EventSource does so by itself) starts it over from
+    a snapshot.
+    """
+
+    def __init__(self, game_pk: int, max_events: int = SUBSCRIBER_BUFFER):
+        self.game_pk = game_pk
+        self.max_events = max_events
+        self.closed = False
+        self._frames = deque()
+        self._cond = threading.Condition()
+
+    def deliver(self, frame: bytes) -> bool:
+        """Queue a frame; returns False if the subscription is (now) closed."""
+        with self._cond:
+            if self.closed:
+                return False
+            if len(self._frames) >= self.max_events:
+                logger.info("Live subscriber for gamePk %s fell behind, disconnecting", self.game_pk)
+                count("live_subscriber_overflow")
+                self.closed = True
+            else:
+                self._frames.append(frame)
+            self._wake()
+            return not self.closed
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._wake()
+
+    def _wake(self):
+        self._cond.notify_all()
+
+    def _pop(self):
+        # Frames queued before close are still handed out
+        if self._frames:
+            return self._frames.popleft()
+        if self.closed:
+            return None
+        raise SubscriptionTimeout()
+
+    def get(self, timeout: float = None) -> bytes:
+        """Next frame, or None once closed; raises SubscriptionTimeout after timeout seconds."""
+        with self._cond:
+            if not self._frames and not self.closed:
+                self._cond.wait(timeout)
+            return self._pop()
+
+class AsyncSubscription(Subscription):
+    """A Subscription read from an event loop; the poller thread wakes the loop."""
+
+    def __init__(self, game_pk: int, max_events: int = SUBSCRIBER_BUFFER):
+        super().__init__(game_pk, max_events)
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def _wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:  # The loop has been closed
+            pass
+
+    async def get_async(self, timeout: float = None) -> bytes:
+        while True:
+            with self._cond:
+                try:
+                    return self._pop()
+                except SubscriptionTimeout:
+                    self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                raise SubscriptionTimeout() from None
+
+class _GameFeed:
+    __slots__ = ("game_pk", "subscribers", "sections", "snapshot_frame", "seq", "timestamp", "wake")
+
+    def __init__(self, game_pk: int):
+        self.game_pk = game_pk
+        self.subscribers = set()
+        self.sections = None  # last published sections
+        self.snapshot_frame = None  # those sections as a snapshot event, for new subscribers
+        self.seq = 0
+        self.timestamp = None  # feed timeStamp the sections were derived from
+        self.wake = threading.Event()
+
+class LiveFeedHub:
+    """
+    Pushes live game updates to subscribers with a single upstream poller per game.
+
+    The first subscriber to a gamePk starts a poller thread that brings the game
+    up to date through the LiveGameTracker every poll_interval seconds. Sections
+    are only re-derived when the feed's timeStamp moved, and only the sections
+    whose value changed are sent, as one "delta" event encoded once for every
+    subscriber. A subscriber first gets a "snapshot" with all sections; a "final"
+    event ends the feed when the game is over. The poller stops once the game has
+    no subscribers, so upstream load follows the number of watched games rather
+    than the number of viewers.
+    """
+
+    def __init__(self, tracker, highlight_count: int = 5, poll_interval: float = POLL_INTERVAL,
+                 on_update=None):
+        self.tracker = tracker
+        self.highlight_count = highlight_count
+        self.poll_interval = poll_interval
+        # Called with (gamePk, (game_details, line_score, highlights)) after sections are re-derived
+        self.on_update = on_update
+        self._games = {}  # gamePk -> _GameFeed with a running poller
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.events = 0
+
+    def subscribe(self, game_pk: int, subscription: Subscription = None) -> Subscription:
+        """
+        Subscribe to a game, starting its poller if needed. The subscription gets the
+        latest snapshot right away if there is one. Call unsubscribe() when done.
+        """
+        subscription = subscription or Subscription(game_pk)
+        with self._lock:
+            feed = self._games.get(game_pk)
+            start = feed is None
+            if start:
+                feed = self._games[game_pk] = _GameFeed(game_pk)
+            feed.subscribers.add(subscription)
+            if feed.snapshot_frame is not None:
+                subscription.deliver(feed.snapshot_frame)
+        if start:
+            threading.Thread(target=self._poll, args=(feed,), name=f"live-{game_pk}", daemon=True).start()
+        count("live_subscribe")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            feed = self._games.get(subscription.game_pk)
+            if feed is None:
+                return
+            feed.subscribers.discard(subscription)
+            if not feed.subscribers:
+                # Let the poller notice right away instead of after its next poll
+                feed.wake.set()
+
+    def sections(self, state) -> dict:
+        """The pushed sections of a LiveGameState (call with state.lock held)."""
+        return {
+            "game_state": state.game_state,
+            "detailed_info": state.game_details,
+            "line_score": state.line_score.to_dict(),
+            "highlights": [h.to_dict() for h in state.highlights()[:self.highlight_count]],
+        }
+
+    def _poll(self, feed: _GameFeed):
+        game_pk = feed.game_pk
+        while True:
+            with self._lock:
+                if not feed.subscribers:
+                    del self._games[game_pk]
+                    return
+                feed.wake.clear()
+
+            try:
+                state = self.tracker.update(game_pk)
+            except Exception as e:
+                logger.warning("Error polling live feed for gamePk %s: %s", game_pk, e)
+                state = None
+            self.polls += 1
+            count("live_poll")
+
+            if state is None:
+                if feed.sections is None:
+                    self._end(feed, "error", {"game_pk": game_pk, "message": "Game feed unavailable"})
+                    return
+            elif state.timestamp is None or state.timestamp != feed.timestamp:
+                with state.lock:
+                    sections = self.sections(state)
+                    feed.timestamp = state.timestamp
+                    game_stats = state.game_details, state.line_score, state.highlights()
+                if self.on_update is not None:
+                    self.on_update(game_pk, game_stats)
+                self._publish(feed, sections)
+                if sections["game_state"] == "Final":
+                    self._end(feed, "final", {"game_pk": game_pk, "game_state": "Final"})
+                    return
+
+            feed.wake.wait(self.poll_interval)
+
+    def _publish(self, feed: _GameFeed, sections: dict):
+        previous = feed.sections
+        changed = {name: value for name, value in sections.items()
+                   if previous is None or previous.get(name) != value}
+        if not changed:
+            return
+        with self._lock:
+            feed.seq += 1
+            feed.sections = sections
+            feed.snapshot_frame = sse_event("snapshot", dict(sections, game_pk=feed.game_pk, seq=feed.seq), feed.seq)
+            frame = feed.snapshot_frame if previous is None else \
+                sse_event("delta", dict(changed, game_pk=feed.game_pk, seq=feed.seq), feed.seq)
+            subscribers = list(feed.subscribers)
+        self._fan_out(feed, subscribers, frame)
+
+    def _end(self, feed: _GameFeed, event: str, data: dict):
+        with self._lock:
+            self._games.pop(feed.game_pk, None)
+            subscribers = list(feed.subscribers)
+            feed.subscribers.clear()
+        self._fan_out(feed, subscribers, sse_event(event, data))
+        for subscription in subscribers:
+            subscription.close()
+
+    def _fan_out(self, feed: _GameFeed, subscribers: list, frame: bytes):
+        self.events += 1
+        count("live_event")
+        for subscription in subscribers:
+            if not subscription.deliver(frame):
+                with self._lock:
+                    feed.subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "games": len(self._games),
+                "subscribers": sum(len(feed.subscribers) for feed in self._games.values()),
+                "polls": self.polls,
+                "events": self.events,
+            }
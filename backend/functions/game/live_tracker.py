@@ -0,0 +1,206 @@
+import logging
+import threading
+from collections import OrderedDict
+from functions.statsapi.statsapi_client import statsapi_get
+from functions.game.game_data import (
+    fetch_game_data,
+    get_detailed_data,
+    rank_play,
+)
+from functions.game.records import InningLine, LineScore
+from functions.game.json_patch import apply_patch, JsonPatchError
+from functions.metrics.metrics import span, observe_bytes, count
+
+logger = logging.getLogger(__name__)
+
+PLAYS_PATH = "/liveData/plays/allPlays"
+INNINGS_PATH = "/liveData/linescore/innings"
+
+def fetch_game_diff(game_pk: int, start_timecode: str):
+    """
+    Fetch the changes to a live feed since start_timecode.
+    statsapi answers with a list of {"diff": [patch operations]} groups, or with the
+    full feed document when it can't produce a diff. Returns None on failure.
+    """
+    with span("feed_diff_fetch", game_pk=game_pk):
+        response = statsapi_get(
+            f"/api/v1.1/game/{game_pk}/feed/live/diffPatch",
+            params={"startTimecode": start_timecode},
+        )
+        if response is not None and response.status_code == 200:
+            observe_bytes("feed_diff", len(response.content))
+            return response.json()
+    logger.warning("Error fetching game diff for gamePk %s: %s", game_pk, getattr(response, "status_code", None))
+    return None
+
+def _touched_index(path: str, prefix: str):
+    """
+    Return the list index a patch path touches under prefix, "*" if the whole list
+    is affected, or None if the path is outside prefix.
+    """
+    if path == prefix or prefix.startswith(path + "/") or path == "":
+        return "*"
+    if not path.startswith(prefix + "/"):
+        return None
+    token = path[len(prefix) + 1:].split("/", 1)[0]
+    if token == "-":
+        return "*"
+    try:
+        return int(token)
+    except ValueError:
+        return "*"
+
+class LiveGameState:
+    """
+    The last known feed for a game plus the derived report, updated in place.
+    line_score is a LineScore and highlights() returns PlayRecords.
+    """
+
+    def __init__(self, game_pk: int, feed: dict, min_score: int = 3):
+        self.game_pk = game_pk
+        self.min_score = min_score
+        self.lock = threading.Lock()
+        self.reset(feed)
+
+    @property
+    def timestamp(self) -> str:
+        return self.feed.get("metaData", {}).get("timeStamp")
+
+    @property
+    def game_state(self) -> str:
+        return self.feed.get("gameData", {}).get("status", {}).get("abstractGameState")
+
+    def reset(self, feed: dict):
+        """Rebuild everything from a full feed document."""
+        self.feed = feed
+        self.game_details = get_detailed_data(feed)
+        self._innings = [InningLine.from_linescore(inning) for inning in feed["liveData"]["linescore"]["innings"]]
+        self._play_highlights = [self._rank(play) for play in feed["liveData"]["plays"]["allPlays"]]
+        self._refresh_line_score()
+
+    def apply_diff(self, groups: list) -> bool:
+        """
+        Apply diff patch groups and update only the derived data they touch.
+        Returns True if anything changed.
+        """
+        touched_plays = set()
+        touched_innings = set()
+        changed = False
+        for group in groups:
+            operations = group.get("diff", [])
+            if not operations:
+                continue
+            self.feed = apply_patch(self.feed, operations)
+            changed = True
+            for op in operations:
+                for path in (op.get("path", ""), op.get("from")):
+                    if path is None:
+                        continue
+                    play_index = _touched_index(path, PLAYS_PATH)
+                    if play_index is not None:
+                        touched_plays.add(play_index)
+                    inning_index = _touched_index(path, INNINGS_PATH)
+                    if inning_index is not None:
+                        touched_innings.add(inning_index)
+        if not changed:
+            return False
+
+        plays = self.feed["liveData"]["plays"]["allPlays"]
+        if "*" in touched_plays or len(self._play_highlights) != len(plays):
+            # Plays were inserted or removed; re-rank from the first touched index on
+            numeric = [i for i in touched_plays if i != "*"]
+            start = 0 if "*" in touched_plays or not numeric else min(numeric)
+            start = min(start, len(self._play_highlights), len(plays))
+            self._play_highlights[start:] = [self._rank(play) for play in plays[start:]]
+        else:
+            for index in touched_plays:
+                self._play_highlights[index] = self._rank(plays[index])
+
+        innings = self.feed["liveData"]["linescore"]["innings"]
+        if "*" in touched_innings or len(self._innings) != len(innings):
+            self._innings = [InningLine.from_linescore(inning) for inning in innings]
+        else:
+            for index in touched_innings:
+                self._innings[index] = InningLine.from_linescore(innings[index])
+
+        self.game_details = get_detailed_data(self.feed)
+        self._refresh_line_score()
+        return True
+
+    def highlights(self) -> list:
+        """Ranked PlayRecords in the same order filter_and_rank_highlights produces."""
+        ranked = [record for record in self._play_highlights if record is not None]
+        ranked.sort(key=lambda record: record.score, reverse=True)
+        return ranked
+
+    def _rank(self, play: dict):
+        record = rank_play(play)
+        return record if record.score >= self.min_score else None
+
+    def _refresh_line_score(self):
+        # Unchanged innings are reused as-is; only the totals are re-summed
+        self.line_score = LineScore.from_linescore(self.feed["liveData"]["linescore"], list(self._innings))
+
+class LiveGameTracker:
+    """
+    Keeps the last live feed per gamePk and brings it up to date with statsapi
+    timestamp diffs instead of re-downloading the whole feed. Line score and
+    highlight ranking are updated only for innings and plays the diff touched.
+    """
+
+    def __init__(self, max_games: int = 64):
+        self.max_games = max_games
+        self._games = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, game_pk: int):
+        """
+        Bring a game up to date and return its LiveGameState, or None if the feed
+        couldn't be fetched. Falls back to a full fetch when the diff can't be applied.
+        """
+        with self._lock:
+            state = self._games.get(game_pk)
+            if state is not None:
+                self._games.move_to_end(game_pk)
+
+        if state is None:
+            feed = fetch_game_data(game_pk)
+            if not feed:
+                return None
+            state = LiveGameState(game_pk, feed)
+            if state.game_state != "Final":
+                self._store(state)
+            return state
+
+        with state.lock:
+            diff = fetch_game_diff(game_pk, state.timestamp) if state.timestamp else None
+            if isinstance(diff, dict) and diff.get("liveData"):
+                state.reset(diff)
+            elif isinstance(diff, list):
+                try:
+                    state.apply_diff(diff)
+                except (JsonPatchError, KeyError, IndexError, TypeError) as e:
+                    logger.info("Could not apply diff for gamePk %s, refetching: %s", game_pk, e)
+                    count("live_diff_refetch")
+                    diff = None
+            if diff is None:
+                feed = fetch_game_data(game_pk)
+                if not feed:
+                    return None
+                state.reset(feed)
+
+        if state.game_state == "Final":
+            # Final games no longer change; the response cache takes over from here
+            self.forget(game_pk)
+        return state
+
+    def forget(self, game_pk: int):
+        with self._lock:
+            self._games.pop(game_pk, None)
+
+    def _store(self, state: LiveGameState):
+        with self._lock:
+            self._games[state.game_pk] = state
+            self._games.move_to_end(state.game_pk)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
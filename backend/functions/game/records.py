@@ -0,0 +1,137 @@
+"""Compact records the parsing layer builds instead of copying upstream feed dicts."""
+
+class PlayerRef:
+    __slots__ = ("id", "full_name")
+
+    def __init__(self, id, full_name):
+        self.id = id
+        self.full_name = full_name
+
+    @classmethod
+    def from_matchup(cls, player: dict):
+        return cls(player.get("id"), player.get("fullName"))
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "fullName": self.full_name}
+
+class PlayRecord:
+    """A ranked play with only the fields a highlight needs."""
+    __slots__ = ("inning", "is_top", "description", "event_type", "play_id", "score", "batter", "pitcher")
+
+    def __init__(self, inning, is_top, description, event_type, play_id, score, batter, pitcher):
+        self.inning = inning
+        self.is_top = is_top
+        self.description = description
+        self.event_type = event_type
+        self.play_id = play_id
+        self.score = score
+        self.batter = batter
+        self.pitcher = pitcher
+
+    @classmethod
+    def from_play(cls, play: dict, score: int):
+        """Build a record from an upstream play without modifying it."""
+        play_id = None
+        for event in reversed(play.get("playEvents", [])):
+            if "playId" in event:
+                play_id = event["playId"]
+                break
+        about = play.get("about", {})
+        result = play.get("result", {})
+        matchup = play.get("matchup", {})
+        return cls(
+            about.get("inning"),
+            about.get("isTopInning"),
+            result.get("description"),
+            result.get("eventType"),
+            play_id,
+            score,
+            PlayerRef.from_matchup(matchup.get("batter", {})),
+            PlayerRef.from_matchup(matchup.get("pitcher", {})),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "inning": self.inning,
+            "isTop": self.is_top,
+            "description": self.description,
+            "event_type": self.event_type,
+            "playId": self.play_id,
+            "score": self.score,
+            "batter": self.batter.to_dict(),
+            "pitcher": self.pitcher.to_dict()
+        }
+
+class TeamLine:
+    """Runs, hits, errors and left on base for one team (an inning or the game total)."""
+    __slots__ = ("runs", "hits", "errors", "left_on_base")
+
+    def __init__(self, runs=0, hits=0, errors=0, left_on_base=0):
+        self.runs = runs
+        self.hits = hits
+        self.errors = errors
+        self.left_on_base = left_on_base
+
+    @classmethod
+    def from_linescore(cls, team: dict):
+        return cls(team.get("runs", 0), team.get("hits", 0), team.get("errors", 0), team.get("leftOnBase", 0))
+
+    def add(self, other):
+        self.runs += other.runs
+        self.hits += other.hits
+        self.errors += other.errors
+        self.left_on_base += other.left_on_base
+
+    def to_dict(self) -> dict:
+        return {"runs": self.runs, "hits": self.hits, "errors": self.errors, "left_on_base": self.left_on_base}
+
+class InningLine:
+    __slots__ = ("inning", "home", "away")
+
+    def __init__(self, inning, home: TeamLine, away: TeamLine):
+        self.inning = inning
+        self.home = home
+        self.away = away
+
+    @classmethod
+    def from_linescore(cls, inning: dict):
+        return cls(inning["num"], TeamLine.from_linescore(inning["home"]), TeamLine.from_linescore(inning["away"]))
+
+    def to_dict(self) -> dict:
+        return {"inning": self.inning, "home": self.home.to_dict(), "away": self.away.to_dict()}
+
+class LineScore:
+    """The line score report: current inning, per-inning lines and game totals."""
+    __slots__ = ("current_inning", "scheduled_innings", "innings", "home_totals", "away_totals")
+
+    def __init__(self, current_inning: str, scheduled_innings, innings: list):
+        self.current_inning = current_inning
+        self.scheduled_innings = scheduled_innings
+        self.innings = innings
+        self.home_totals = TeamLine()
+        self.away_totals = TeamLine()
+        for inning in innings:
+            self.home_totals.add(inning.home)
+            self.away_totals.add(inning.away)
+
+    @classmethod
+    def from_linescore(cls, linescore_data: dict, innings: list = None):
+        """
+        Build from a feed linescore. Pre-built InningLine records can be passed in
+        to avoid re-reading innings that haven't changed.
+        """
+        if innings is None:
+            innings = [InningLine.from_linescore(inning) for inning in linescore_data["innings"]]
+        current_inning = f"{linescore_data['currentInningOrdinal']} ({linescore_data['inningState']})"
+        return cls(current_inning, linescore_data["scheduledInnings"], innings)
+
+    def to_dict(self) -> dict:
+        return {
+            "current_inning": self.current_inning,
+            "scheduled_innings": self.scheduled_innings,
+            "innings": [inning.to_dict() for inning in self.innings],
+            "totals": {
+                "home": self.home_totals.to_dict(),
+                "away": self.away_totals.to_dict()
+            }
+        }
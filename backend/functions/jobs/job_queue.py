@@ -0,0 +1,168 @@
+import heapq
+import itertools
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+class Job:
+    """A unit of background work; status is one of queued, running, done, failed, dropped."""
+
+    __slots__ = ("id", "key", "priority", "fn", "args", "status", "result", "error", "created_at", "finished_at")
+
+    def __init__(self, key, priority, fn, args):
+        self.id = secrets.token_hex(8)
+        self.key = key
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobQueue:
+    """
+    Bounded worker pool fed from a priority queue, with one job per key.
+
+    Submitting a key that already has a queued, running or recently finished job
+    returns that job instead of adding another, so a burst of requests for the same
+    game costs one run. Higher priorities run first, and among equal priorities the
+    most recently submitted job runs first; resubmitting a queued key moves it up.
+    When more than max_pending jobs are queued, the lowest-priority one is dropped.
+    A finished job is reused for done_ttl seconds (None: until it is forgotten).
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 256, max_finished: int = 1024,
+                 done_ttl: float = None, thread_name_prefix: str = "jobs"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.done_ttl = done_ttl
+        self.thread_name_prefix = thread_name_prefix
+        self._heap = []  # (-priority, -seq, job); entries whose seq is outdated are skipped
+        self._seq = itertools.count()
+        self._queued_seq = {}  # job id -> seq of its live heap entry
+        self._jobs = {}  # job id -> job, for queued and running jobs
+        self._finished = OrderedDict()  # job id -> job, oldest first
+        self._by_key = {}  # key -> job
+        self._cond = threading.Condition()
+        self._started_pid = None
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+    def _ensure_started(self):
+        # Threads don't survive a fork, so each process starts its own pool on first use
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+        self._started_pid = pid
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"{self.thread_name_prefix}-{i}", daemon=True).start()
+
+    def submit(self, key, fn, *args, priority=0) -> Job:
+        """Queue fn(*args) under key unless the key already has a live or finished job; return the job."""
+        with self._cond:
+            self._ensure_started()
+            job = self._by_key.get(key)
+            if job is not None and job.status == "done" and self.done_ttl is not None \
+                    and time.time() - job.finished_at >= self.done_ttl:
+                job = None
+            if job is not None:
+                self.deduplicated += 1
+                if job.status == "queued":
+                    self._push(job)
+                return job
+
+            job = Job(key, priority, fn, args)
+            self._by_key[key] = job
+            self._jobs[job.id] = job
+            self.submitted += 1
+            self._push(job)
+            if len(self._queued_seq) > self.max_pending:
+                self._drop_lowest()
+            self._cond.notify()
+            return job
+
+    def get(self, job_id: str) -> Job:
+        """Return the job with this id, or None if it is unknown or has been forgotten."""
+        with self._cond:
+            return self._jobs.get(job_id) or self._finished.get(job_id)
+
+    def _push(self, job: Job):
+        seq = next(self._seq)
+        self._queued_seq[job.id] = seq
+        heapq.heappush(self._heap, (-job.priority, -seq, job))
+
+    def _drop_lowest(self):
+        _, _, job = max(entry for entry in self._heap if self._queued_seq.get(entry[2].id) == -entry[1])
+        del self._queued_seq[job.id]
+        self._heap = [entry for entry in self._heap if entry[2] is not job]
+        heapq.heapify(self._heap)
+        self.dropped += 1
+        self._finish(job, "dropped", error="Dropped from a full queue")
+
+    def _finish(self, job: Job, status: str, result=None, error: str = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.fn = job.args = None
+        self._jobs.pop(job.id, None)
+        self._finished[job.id] = job
+        while len(self._finished) > self.max_finished:
+            _, old = self._finished.popitem(last=False)
+            if self._by_key.get(old.key) is old:
+                del self._by_key[old.key]
+        if status != "done" and self._by_key.get(job.key) is job:
+            # Let the next submit for this key try again
+            del self._by_key[job.key]
+
+    def _next_job(self) -> Job:
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, neg_seq, job = heapq.heappop(self._heap)
+                    if self._queued_seq.get(job.id) == -neg_seq:
+                        del self._queued_seq[job.id]
+                        job.status = "running"
+                        return job
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            try:
+                result = job.fn(*job.args)
+            except Exception as e:
+                with self._cond:
+                    self._finish(job, "failed", error=str(e))
+                continue
+            with self._cond:
+                self._finish(job, "done", result=result)
+
+    def stats(self) -> dict:
+        with self._cond:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            return {
+                "queued": len(self._queued_seq),
+                "running": running,
+                "finished": len(self._finished),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "workers": self.workers,
+            }
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+span_logger = logging.getLogger("mlb.spans")
+
+# Fraction of timing spans also emitted as structured log lines (histograms always record every span)
+SPAN_LOG_SAMPLE_RATE = float(os.environ.get("MLB_SPAN_LOG_SAMPLE_RATE", "0"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', bound),))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(key)} {value}" for key, value in items)
+        return lines
+
+STAGE_DURATION = Histogram("mlb_stage_duration_seconds", "Duration of pipeline stages.", LATENCY_BUCKETS)
+REQUEST_DURATION = Histogram("mlb_request_duration_seconds", "Duration of HTTP requests by route.", LATENCY_BUCKETS)
+PAYLOAD_BYTES = Histogram("mlb_payload_bytes", "Size of upstream and response payloads.", SIZE_BUCKETS)
+EVENTS = Counter("mlb_events_total", "Pipeline events such as cache hits and misses.")
+
+_gauges = []  # (name, help_text, callback returning {labels tuple: value})
+
+def register_gauges(name: str, help_text: str, callback):
+    """
+    Register a gauge family whose values are read at scrape time. callback returns
+    a dict mapping a label dict's items (as a tuple) to a value, or a single number.
+    """
+    _gauges.append((name, help_text, callback))
+
+@contextmanager
+def span(stage: str, **fields):
+    """Time a pipeline stage into mlb_stage_duration_seconds (and a sampled log line)."""
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        if SPAN_LOG_SAMPLE_RATE and random.random() < SPAN_LOG_SAMPLE_RATE:
+            record = {"span": stage, "duration_ms": round(elapsed * 1000, 2), **fields}
+            if error:
+                record["error"] = error
+            span_logger.info(json.dumps(record, default=str))
+
+def observe_bytes(kind: str, size):
+    """Record a payload size in bytes (ignored if unknown)."""
+    if size is not None:
+        PAYLOAD_BYTES.observe(int(size), kind=kind)
+
+def count(event: str, **labels):
+    EVENTS.inc(event=event, **labels)
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in (STAGE_DURATION, REQUEST_DURATION, PAYLOAD_BYTES, EVENTS):
+        lines.extend(metric.render())
+    for name, help_text, callback in _gauges:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        try:
+            values = callback()
+        except Exception:
+            continue
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in sorted(values.items()):
+            lines.append(f"{name}{_format_labels(key)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,67 @@
+"""Per-worker startup phases (imports, app setup, Vertex AI warm-up) and their report."""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functions.metrics.metrics import register_gauges
+
+logger = logging.getLogger(__name__)
+
+_phases = []  # (phase, seconds, pid), in the order they finished
+_lock = threading.Lock()
+_last_mark = time.perf_counter()
+
+def _record(phase: str, seconds: float):
+    global _last_mark
+    with _lock:
+        _phases.append((phase, seconds, os.getpid()))
+        _last_mark = time.perf_counter()
+
+def mark_startup(phase: str):
+    """Record the time since the previous mark or phase (or since this module was imported) as a phase."""
+    _record(phase, time.perf_counter() - _last_mark)
+
+@contextmanager
+def startup_phase(phase: str):
+    """Time a block of startup work (an SDK import, a client init) as a phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(phase, time.perf_counter() - started)
+
+def startup_report() -> dict:
+    pid = os.getpid()
+    with _lock:
+        phases = list(_phases)
+    return {
+        "pid": pid,
+        "preloaded": any(phase_pid != pid for _, _, phase_pid in phases),
+        "total_seconds": round(sum(seconds for _, seconds, _ in phases), 4),
+        "phases": [
+            {"phase": phase, "seconds": round(seconds, 4), "process": "worker" if phase_pid == pid else "master"}
+            for phase, seconds, phase_pid in phases
+        ],
+    }
+
+def log_startup_report(stage: str):
+    """Log the phases recorded so far as one line; stage says where in startup this is."""
+    report = startup_report()
+    logger.info("Startup (%s) pid %s: %.3fs total; %s", stage, report["pid"], report["total_seconds"],
+                ", ".join(f"{p['phase']}={p['seconds']:.3f}s" + (" (master)" if p["process"] == "master" else "")
+                          for p in report["phases"]))
+
+register_gauges("mlb_startup_seconds", "Time spent in each startup phase of this worker.",
+                lambda: {(("phase", p["phase"]), ("process", p["process"])): p["seconds"]
+                         for p in startup_report()["phases"]})
+
+# Import the app in a fresh interpreter and print the report (for a per-module
+# breakdown of the imports phase: python -X importtime -c "import main")
+if __name__ == "__main__":
+    os.environ.setdefault("MLB_WARMUP", "sync")
+    import main  # noqa: F401
+    # main recorded into the imported module, not this __main__ copy
+    from functions.metrics import startup
+    print(json.dumps(startup.startup_report(), indent=2))
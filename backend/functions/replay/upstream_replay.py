@@ -0,0 +1,147 @@
+"""Record/replay of upstream traffic (statsapi responses and LLM replies)."""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# "live" talks to statsapi and Vertex AI as usual, "record" also saves every response
+# to MLB_FIXTURE_DIR, and "replay" serves the saved fixtures without touching the
+# network, delayed by the latencies below (unrecorded prompts get a stand-in reply)
+MODE = os.environ.get("MLB_UPSTREAM_MODE", "live")
+FIXTURE_DIR = os.environ.get(
+    "MLB_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "outputs", "fixtures"),
+)
+STATSAPI_LATENCY = float(os.environ.get("MLB_REPLAY_LATENCY_MS", "0")) / 1000
+LLM_LATENCY = float(os.environ.get("MLB_REPLAY_LLM_LATENCY_MS", "0")) / 1000
+
+def is_recording() -> bool:
+    return MODE == "record"
+
+def is_replaying() -> bool:
+    return MODE == "replay"
+
+def _fixture_path(kind: str, key_material) -> str:
+    digest = hashlib.sha256(json.dumps(key_material, sort_keys=True).encode("utf-8")).hexdigest()
+    return os.path.join(FIXTURE_DIR, kind, f"{digest[:32]}.json")
+
+def _write_fixture(path: str, fixture: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(fixture, f)
+    os.replace(tmp_path, path)
+
+def _read_fixture(path: str):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response, built from recorded bytes."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+        self.raw = io.BytesIO(content)
+        self.headers = {"Content-Length": str(len(content))}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+def _statsapi_key(path: str, params: dict) -> list:
+    return [path, sorted((str(k), str(v)) for k, v in (params or {}).items())]
+
+def record_statsapi(path: str, params: dict, response) -> ReplayResponse:
+    """Save a live statsapi response and return a replayable copy of it."""
+    content = response.content
+    _write_fixture(_fixture_path("statsapi", _statsapi_key(path, params)), {
+        "path": path,
+        "params": params,
+        "status_code": response.status_code,
+        "body": content.decode("utf-8"),
+    })
+    response.close()
+    return ReplayResponse(response.status_code, content)
+
+def replay_statsapi(path: str, params: dict) -> ReplayResponse:
+    """Serve a recorded statsapi response (404 if none was recorded)."""
+    if STATSAPI_LATENCY:
+        time.sleep(STATSAPI_LATENCY)
+    return _replayed_statsapi(path, params)
+
+async def replay_statsapi_async(path: str, params: dict) -> ReplayResponse:
+    """replay_statsapi for the async client; the injected latency doesn't block the loop."""
+    if STATSAPI_LATENCY:
+        await asyncio.sleep(STATSAPI_LATENCY)
+    return _replayed_statsapi(path, params)
+
+def _replayed_statsapi(path: str, params: dict) -> ReplayResponse:
+    fixture = _read_fixture(_fixture_path("statsapi", _statsapi_key(path, params)))
+    if fixture is None:
+        logger.warning("No recorded statsapi response for %s %s", path, params)
+        return ReplayResponse(404, b"{}")
+    return ReplayResponse(fixture["status_code"], fixture["body"].encode("utf-8"))
+
+class _Reply:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+class ReplayModel:
+    """
+    LLM stand-in with the generate_content interface of GenerativeModel.
+    In record mode it wraps the real model and saves each reply; in replay mode it
+    answers from the recordings.
+    """
+
+    def __init__(self, model_name: str, model=None):
+        self.model_name = model_name
+        self.model = model
+
+    def _path(self, contents, generation_config) -> str:
+        return _fixture_path("llm", [self.model_name, generation_config, contents])
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        path = self._path(contents, generation_config)
+        if self.model is not None:
+            response = self.model.generate_content(contents=contents, generation_config=generation_config, **kwargs)
+            text = self._record(path, contents, response.text)
+        else:
+            if LLM_LATENCY:
+                time.sleep(LLM_LATENCY)
+            text = self._replayed(path)
+        if stream:
+            return iter([_Reply(text)])
+        return _Reply(text)
+
+    async def generate_content_async(self, contents, generation_config=None, **kwargs):
+        path = self._path(contents, generation_config)
+        if self.model is not None:
+            response = await self.model.generate_content_async(
+                contents=contents, generation_config=generation_config, **kwargs)
+            return _Reply(self._record(path, contents, response.text))
+        if LLM_LATENCY:
+            await asyncio.sleep(LLM_LATENCY)
+        return _Reply(self._replayed(path))
+
+    def _record(self, path: str, contents, text: str) -> str:
+        _write_fixture(path, {"model": self.model_name, "contents": contents, "text": text})
+        return text
+
+    def _replayed(self, path: str) -> str:
+        fixture = _read_fixture(path)
+        if fixture is not None:
+            return fixture["text"]
+        return f"[replay] No recorded response ({os.path.basename(path)[:12]})."
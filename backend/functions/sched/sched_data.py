@@ -1,17 +1,49 @@
-import requests
+import logging
+from functions.statsapi.statsapi_client import statsapi_get
+from functions.statsapi.statsapi_async import async_statsapi_get
+from functions.metrics.metrics import span, observe_bytes
+
+logger = logging.getLogger(__name__)
 
 def get_schedule_data(date: str, team_id: int) -> dict:
     """
     Fetch the MLB schedule data for a specific team on the specified date.
     Returns the schedule JSON for the team.
     """
-    api_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date}&teamId={team_id}"
-    response = requests.get(api_url)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error fetching schedule for team {team_id}: {response.status_code}")
-        return {}
+    with span("schedule_fetch"):
+        response = statsapi_get("/api/v1/schedule", params={"sportId": 1, "date": date, "teamId": team_id})
+        if response is not None and response.status_code == 200:
+            observe_bytes("schedule", len(response.content))
+            return response.json()
+    logger.warning("Error fetching schedule for team %s: %s", team_id, getattr(response, "status_code", None))
+    return {}
+
+async def get_schedule_data_async(date: str, team_id: int) -> dict:
+    """Async variant of get_schedule_data."""
+    with span("schedule_fetch"):
+        response = await async_statsapi_get("/api/v1/schedule", params={"sportId": 1, "date": date, "teamId": team_id})
+        if response is not None and response.status_code == 200:
+            observe_bytes("schedule", len(response.content))
+            return response.json()
+    logger.warning("Error fetching schedule for team %s: %s", team_id, getattr(response, "status_code", None))
+    return {}
+
+def get_schedule_range(start_date: str, end_date: str, team_id: int = None) -> dict:
+    """
+    Fetch the MLB schedule for every game between start_date and end_date (inclusive),
+    optionally limited to one team. Returns the schedule JSON.
+    """
+    params = {"sportId": 1, "startDate": start_date, "endDate": end_date}
+    if team_id is not None:
+        params["teamId"] = team_id
+    with span("schedule_range_fetch"):
+        response = statsapi_get("/api/v1/schedule", params=params)
+        if response is not None and response.status_code == 200:
+            observe_bytes("schedule_range", len(response.content))
+            return response.json()
+    logger.warning("Error fetching schedule from %s to %s: %s", start_date, end_date,
+                   getattr(response, "status_code", None))
+    return {}
 
 def extract_game_pk(schedule_data: dict) -> int:
     """
@@ -24,9 +56,35 @@ def extract_game_pk(schedule_data: dict) -> int:
                 game_pk = game.get("gamePk")
                 if game_pk:
                     return game_pk
-    print("No games found for the specified team and date.")
+    logger.info("No games found for the specified team and date.")
+    return None
+
+def list_schedule_games(schedule_data: dict) -> list:
+    """
+    Return every game entry in the schedule data, in schedule order.
+    """
+    return [game for date_info in schedule_data.get("dates", []) for game in date_info.get("games", [])]
+
+def select_game(games: list, game_number: int = None) -> dict:
+    """
+    Pick a game from a team's games on one date. Without game_number the first game
+    with a gamePk is returned (like extract_game_pk); with it, the matching game of
+    a doubleheader. Returns None if there is no such game.
+    """
+    for game in games:
+        if not game.get("gamePk"):
+            continue
+        if game_number is None or game.get("gameNumber", 1) == game_number:
+            return game
     return None
 
+def schedule_data_for_game(date: str, game: dict) -> dict:
+    """
+    Wrap a single schedule game entry in the shape returned by get_schedule_data,
+    so extract_game_pk and pull_schedule_data read that game.
+    """
+    return {"dates": [{"date": date, "games": [game]}]}
+
 def pull_schedule_data(schedule_data: dict) -> dict:
     """
     Extract final scores, records, and determine the winner from the schedule data.
@@ -52,10 +110,12 @@ def pull_schedule_data(schedule_data: dict) -> dict:
             "content_link": schedule_game["content"]["link"],
             "venue": schedule_game["venue"]["name"],
             "home_team_id": home_team_id,
-            "away_team_id": away_team_id
+            "away_team_id": away_team_id,
+            "game_state": schedule_game.get("status", {}).get("abstractGameState"),
+            "game_number": schedule_game.get("gameNumber", 1)
         }
         
         return game_info
     except (KeyError, IndexError) as e:
-        print(f"Error extracting schedule data: {e}")
+        logger.warning("Error extracting schedule data: %s", e)
         return {}
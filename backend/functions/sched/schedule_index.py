@@ -0,0 +1,121 @@
+import logging
+import os
+import threading
+import time
+from datetime import date as date_type, datetime, timedelta
+from functions.sched.sched_data import get_schedule_range
+
+logger = logging.getLogger(__name__)
+
+def _date_range(start_date: str, end_date: str):
+    day = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last = datetime.strptime(end_date, "%Y-%m-%d").date()
+    while day <= last:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+class ScheduleIndex:
+    """
+    In-memory index of the season schedule answering (date, team_id) -> games.
+
+    The whole range is loaded with one bulk schedule fetch and reloaded every
+    full_refresh seconds; the days around today, where scores and game states
+    change, are reloaded every hot_refresh seconds. Loading happens on a background
+    thread started on first use in each process, so lookups never wait on statsapi.
+    """
+
+    def __init__(self, start_date: str = None, end_date: str = None,
+                 hot_refresh: float = 60, full_refresh: float = 6 * 3600, hot_days: int = 1):
+        year = date_type.today().year
+        self.start_date = start_date or f"{year}-01-01"
+        self.end_date = end_date or f"{year}-12-31"
+        self.hot_refresh = hot_refresh
+        self.full_refresh = full_refresh
+        self.hot_days = hot_days
+        self._by_date = {}  # date -> {team_id: [schedule games]}
+        self._lock = threading.Lock()
+        self._thread_pid = None
+        self.loaded_at = None
+
+    def ensure_started(self):
+        """Start the refresh thread in this process if it isn't running yet."""
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            self._thread_pid = pid
+        threading.Thread(target=self._run, name="schedule-index", daemon=True).start()
+
+    def load(self, start_date: str, end_date: str) -> bool:
+        """Fetch the schedule for a date range and replace those dates in the index."""
+        schedule_data = get_schedule_range(start_date, end_date)
+        if not schedule_data:
+            return False
+        loaded = {day: {} for day in _date_range(start_date, end_date)}
+        for date_info in schedule_data.get("dates", []):
+            teams = loaded.setdefault(date_info["date"], {})
+            for game in date_info.get("games", []):
+                for side in ("home", "away"):
+                    team_id = game["teams"][side]["team"]["id"]
+                    teams.setdefault(team_id, []).append(game)
+        for teams in loaded.values():
+            for games in teams.values():
+                games.sort(key=lambda game: game.get("gameNumber", 1))
+        with self._lock:
+            self._by_date.update(loaded)
+        self.loaded_at = time.time()
+        return True
+
+    def lookup(self, date: str, team_id: int):
+        """
+        Return the team's schedule games on date, ordered by gameNumber ([] if it
+        didn't play), or None if the date isn't indexed (yet).
+        """
+        self.ensure_started()
+        teams = self._by_date.get(date)
+        if teams is None:
+            return None
+        return teams.get(team_id, [])
+
+    def games_on(self, date: str):
+        """
+        Return every schedule game on date once (each is indexed under both teams),
+        ordered by start time, or None if the date isn't indexed (yet).
+        """
+        self.ensure_started()
+        teams = self._by_date.get(date)
+        if teams is None:
+            return None
+        games = {game["gamePk"]: game for team_games in list(teams.values()) for game in team_games}
+        return sorted(games.values(), key=lambda game: (game.get("gameDate", ""), game["gamePk"]))
+
+    def game_pks(self, date: str, team_id: int):
+        """Return the team's gamePks on date, or None if the date isn't indexed."""
+        games = self.lookup(date, team_id)
+        return None if games is None else [game["gamePk"] for game in games]
+
+    def stats(self) -> dict:
+        return {
+            "dates": len(self._by_date),
+            "games": len({game["gamePk"] for teams in list(self._by_date.values())
+                          for games in teams.values() for game in games}),
+            "loaded_at": self.loaded_at,
+        }
+
+    def _run(self):
+        last_full = None
+        while True:
+            now = time.monotonic()
+            try:
+                if last_full is None or now - last_full >= self.full_refresh:
+                    if self.load(self.start_date, self.end_date):
+                        last_full = now
+                else:
+                    today = date_type.today()
+                    self.load((today - timedelta(days=self.hot_days)).isoformat(),
+                              (today + timedelta(days=self.hot_days)).isoformat())
+            except Exception as e:
+                logger.warning("Error refreshing schedule index: %s", e)
+            time.sleep(self.hot_refresh)
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import os
+import httpx
+from functions.replay import upstream_replay
+from functions.statsapi.statsapi_client import STATSAPI_BASE_URL, CONNECT_TIMEOUT, READ_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Connections kept per event loop; one loop can have hundreds of requests in flight
+ASYNC_POOL_SIZE = int(os.environ.get("STATSAPI_ASYNC_POOL_SIZE", "100"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_STATUS_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+_client = None
+_client_loop = None
+
+def _build_client() -> httpx.AsyncClient:
+    """
+    Create an async client with a keep-alive pool and gzip negotiation.
+    Connection errors are retried by the transport; 429/5xx by async_statsapi_get.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        retries=3,
+        limits=httpx.Limits(max_connections=ASYNC_POOL_SIZE, max_keepalive_connections=ASYNC_POOL_SIZE),
+    )
+    return httpx.AsyncClient(
+        base_url=STATSAPI_BASE_URL,
+        transport=transport,
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
+    )
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the statsapi client for the running event loop.
+    Pooled connections belong to one loop, so a new client is created if the loop changes.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = _build_client()
+        _client_loop = loop
+    return _client
+
+async def close_async_client():
+    """Close the pooled connections of the current client (on ASGI shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
+
+async def async_statsapi_get(path: str, params: dict = None, timeout=None):
+    """
+    Async counterpart of statsapi_get. The whole body is read before returning,
+    and the response has the status_code/content/headers/json() used by the sync fetchers.
+    Returns None if the request failed after retries.
+    """
+    if upstream_replay.is_replaying():
+        return await upstream_replay.replay_statsapi_async(path, params)
+    url = path if path.startswith("http") else f"{STATSAPI_BASE_URL}{path}"
+    client = get_async_client()
+    try:
+        for attempt in range(MAX_STATUS_RETRIES + 1):
+            response = await client.get(url, params=params, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_STATUS_RETRIES:
+                break
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else BACKOFF_FACTOR * (2 ** attempt)
+            await asyncio.sleep(delay)
+    except httpx.HTTPError as e:
+        logger.warning("Error requesting %s: %s", url, e)
+        return None
+    if upstream_replay.is_recording():
+        return upstream_replay.record_statsapi(path, params, response)
+    return response
@@ -0,0 +1,82 @@
+import logging
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functions.replay import upstream_replay
+
+logger = logging.getLogger(__name__)
+
+STATSAPI_BASE_URL = os.environ.get("STATSAPI_BASE_URL", "https://statsapi.mlb.com")
+
+# (connect, read) timeouts in seconds so a stalled upstream can't pin a worker
+CONNECT_TIMEOUT = float(os.environ.get("STATSAPI_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.environ.get("STATSAPI_READ_TIMEOUT", "10"))
+
+# Keep-alive pool size; should be at least the number of threads issuing requests
+POOL_SIZE = int(os.environ.get("STATSAPI_POOL_SIZE", "32"))
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+def _build_session() -> requests.Session:
+    """
+    Create a session with a keep-alive connection pool, gzip negotiation and
+    bounded retries with exponential backoff on connection errors and 429/5xx.
+    """
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide statsapi session.
+    A new session is created after a fork so workers never share pooled sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+def statsapi_get(path: str, params: dict = None, timeout=None, stream: bool = False):
+    """
+    GET a statsapi path (e.g. "/api/v1/schedule") through the shared session.
+    Returns the response, or None if the request failed after retries.
+    With stream=True the body is left on the socket and the caller must close the response.
+    In record/replay mode (MLB_UPSTREAM_MODE) responses are saved to or served from fixtures.
+    """
+    if upstream_replay.is_replaying():
+        return upstream_replay.replay_statsapi(path, params)
+    url = path if path.startswith("http") else f"{STATSAPI_BASE_URL}{path}"
+    try:
+        response = get_session().get(url, params=params, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), stream=stream)
+    except requests.RequestException as e:
+        logger.warning("Error requesting %s: %s", url, e)
+        return None
+    if upstream_replay.is_recording():
+        return upstream_replay.record_statsapi(path, params, response)
+    return response
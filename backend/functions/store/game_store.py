@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from functions.store.sqlite_file import SQLiteFile
+
+# App Engine standard only allows writes under /tmp; override with MLB_GAME_STORE_PATH
+DEFAULT_STORE_PATH = os.path.join(tempfile.gettempdir(), "mlb_games.sqlite3")
+
+# How long a stored game that isn't final (or is incomplete) may be served, in seconds
+DEFAULT_STALE_AFTER = {
+    "Live": 30,
+    "Preview": 300,
+}
+
+def payload_complete(combined_data: dict) -> bool:
+    """
+    True if every stage of a payload succeeded: both summaries were generated and
+    the content was fetched (a failed or timed-out content stage leaves content_data {}).
+    """
+    return bool(combined_data.get("detailed_summary") and combined_data.get("concise_summary")
+                and combined_data.get("content_data"))
+
+class GameStore(SQLiteFile):
+    """
+    Embedded SQLite store for combined game payloads.
+
+    Rows are keyed by gamePk and indexed by date and by home/away team id, so a
+    (date, team_id) request is a single indexed lookup. Payloads are stored as
+    zlib-compressed JSON. Complete final games (see payload_complete) never go
+    stale; other games, including finals built while a stage was degraded, are only
+    served while younger than their state's stale_after window.
+    """
+
+    def __init__(self, path: str = None, stale_after: dict = None, compress_level: int = 6):
+        super().__init__(path or os.environ.get("MLB_GAME_STORE_PATH", DEFAULT_STORE_PATH))
+        self.stale_after = dict(DEFAULT_STALE_AFTER if stale_after is None else stale_after)
+        self.compress_level = compress_level
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " game_pk INTEGER PRIMARY KEY,"
+            " date TEXT NOT NULL,"
+            " home_team_id INTEGER,"
+            " away_team_id INTEGER,"
+            " game_state TEXT,"
+            # 1 if payload_complete (the name predates the content check)
+            " has_summaries INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " payload BLOB NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_games_date_home ON games (date, home_team_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_games_date_away ON games (date, away_team_id)")
+
+    def _row(self, combined_data: dict, now: float) -> tuple:
+        teams = combined_data.get("game_info", {}).get("teams", {})
+        payload = json.dumps(combined_data, separators=(",", ":")).encode("utf-8")
+        return (
+            combined_data["game_pk"],
+            combined_data["date"],
+            teams.get("home", {}).get("team_id"),
+            teams.get("away", {}).get("team_id"),
+            combined_data.get("game_info", {}).get("game_state"),
+            1 if payload_complete(combined_data) else 0,
+            now,
+            zlib.compress(payload, self.compress_level),
+        )
+
+    def put(self, combined_data: dict):
+        """Insert or replace one game payload."""
+        self.put_many([combined_data])
+
+    def put_many(self, payloads: list):
+        """Insert or replace many game payloads in a single transaction."""
+        if not payloads:
+            return
+        now = time.time()
+        rows = [self._row(combined_data, now) for combined_data in payloads]
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO games"
+                " (game_pk, date, home_team_id, away_team_id, game_state, has_summaries, updated_at, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, game_pk: int, fresh_only: bool = False) -> dict:
+        """Return the stored payload for a gamePk, or None (also if stale and fresh_only)."""
+        row = self._connect().execute(
+            "SELECT game_state, has_summaries, updated_at, payload FROM games WHERE game_pk = ?", (game_pk,)
+        ).fetchone()
+        if row is None or (fresh_only and not self.is_fresh(row[0], row[1], row[2])):
+            return None
+        return json.loads(zlib.decompress(row[3]))
+
+    def get_status(self, game_pk: int) -> dict:
+        """Return the indexed metadata for a gamePk without decompressing its payload, or None."""
+        row = self._connect().execute(
+            "SELECT game_state, has_summaries, updated_at FROM games WHERE game_pk = ?", (game_pk,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"game_state": row[0], "complete": bool(row[1]), "updated_at": row[2]}
+
+    def find(self, date: str, team_id: int, fresh_only: bool = True) -> list:
+        """
+        Return the payloads for games a team played on a date, ordered by gamePk.
+        With fresh_only, stale non-final games are left out.
+        """
+        # Two index lookups (home side and away side) rather than an OR that can't use either index
+        rows = self._connect().execute(
+            "SELECT game_pk, game_state, has_summaries, updated_at, payload FROM games"
+            " WHERE date = ? AND home_team_id = ?"
+            " UNION ALL "
+            "SELECT game_pk, game_state, has_summaries, updated_at, payload FROM games"
+            " WHERE date = ? AND away_team_id = ?"
+            " ORDER BY game_pk",
+            (date, team_id, date, team_id),
+        ).fetchall()
+        return [
+            json.loads(zlib.decompress(payload))
+            for _, game_state, complete, updated_at, payload in rows
+            if not fresh_only or self.is_fresh(game_state, complete, updated_at)
+        ]
+
+    def is_fresh(self, game_state: str, complete, updated_at: float) -> bool:
+        """
+        Unknown states fall back to the shortest configured window, or never go
+        stale if no state has one.
+        """
+        if game_state == "Final" and complete:
+            return True
+        if game_state in self.stale_after:
+            stale_after = self.stale_after[game_state]
+        else:
+            stale_after = min((s for s in self.stale_after.values() if s is not None), default=None)
+        return stale_after is None or time.time() - updated_at < stale_after
+
+    def stats(self) -> dict:
+        entries, stored_bytes = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM games"
+        ).fetchone()
+        return {"path": self.path, "games": entries, "bytes": stored_bytes}
@@ -0,0 +1,221 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functions.store.game_store import DEFAULT_STORE_PATH
+from functions.store.sqlite_file import SQLiteFile
+from functions.game.highlight_ranking import top_k_highlights
+from functions.metrics.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Seconds the writer waits after the first queued game so a burst of builds shares a transaction
+WRITE_DELAY = float(os.environ.get("MLB_PLAYER_INDEX_DELAY", "0.5"))
+
+ROLES = ("batter", "pitcher")
+
+class PlayerHighlightIndex(SQLiteFile):
+    """
+    Inverted index from player id to the ranked highlights the player was in.
+
+    Every ranked play of a processed game is indexed under its batter and its
+    pitcher, with the game's date, so "a player's top plays over some dates" is
+    one indexed lookup that never touches statsapi. Rows live in SQLite (by default
+    next to the game store), shared by every worker. Re-indexing a game replaces
+    its rows; a game whose highlights haven't changed since this process last
+    indexed it is skipped without a write.
+
+    Request paths use submit(), which hands the game to a writer thread that also
+    ranks the plays when given a feed's plays rather than ranked highlights. The
+    writer collects games for write_delay seconds and writes them in one
+    transaction, so a burst of builds costs a few writes instead of one per game.
+    """
+
+    def __init__(self, path: str = None, min_score: int = 3, write_delay: float = WRITE_DELAY):
+        self.min_score = min_score
+        self.write_delay = write_delay
+        super().__init__(path or os.environ.get("MLB_GAME_STORE_PATH", DEFAULT_STORE_PATH))
+        self._indexed = {}  # gamePk -> signature of the highlights last written by this process
+        self._pending = {}  # gamePk -> (date, highlights, plays) waiting for the writer
+        self._writing = False
+        self._cond = threading.Condition()
+        self._writer_pid = None
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS player_highlights ("
+            " player_id INTEGER NOT NULL,"
+            " player_name TEXT,"
+            " role TEXT NOT NULL,"
+            " game_pk INTEGER NOT NULL,"
+            " date TEXT NOT NULL,"
+            " inning INTEGER,"
+            " is_top INTEGER,"
+            " score INTEGER NOT NULL,"
+            " play_id TEXT,"
+            " event_type TEXT,"
+            " description TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_player_highlights_player"
+                     " ON player_highlights (player_id, date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_player_highlights_game"
+                     " ON player_highlights (game_pk)")
+
+    @staticmethod
+    def _signature(highlights: list) -> tuple:
+        return tuple((record.play_id, record.score, record.description) for record in highlights)
+
+    def index_game(self, game_pk: int, date: str, highlights: list) -> bool:
+        """
+        Replace a game's rows with its ranked highlights (PlayRecords) right away.
+        Returns False if they were unchanged since this process last indexed the game.
+        """
+        return bool(self._write({game_pk: (date, highlights, None)}))
+
+    def submit(self, game_pk: int, date: str, highlights: list = None, plays: list = None) -> bool:
+        """
+        Queue a game for the writer thread with either its ranked highlights or its
+        feed's allPlays (ranked on the writer thread, the list must not change). A
+        newer submit for the same game replaces a queued one. Returns False if
+        there is nothing to write.
+        """
+        if not date:
+            return False
+        with self._cond:
+            if highlights is not None and self._indexed.get(game_pk) == self._signature(highlights):
+                return False
+            self._pending[game_pk] = (date, highlights, plays)
+            self._ensure_writer()
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every submitted game is written; False if timeout elapsed first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _ensure_writer(self):
+        # A forked child inherits the queued games but not the writer thread, so it starts its own
+        pid = os.getpid()
+        if self._writer_pid != pid:
+            self._writer_pid = pid
+            threading.Thread(target=self._write_loop, name="player-index", daemon=True).start()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                self._writing = True
+            time.sleep(self.write_delay)
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            # Nothing may escape: a dead writer would leave every later submit unwritten
+            try:
+                self._write(batch)
+            except sqlite3.Error as e:
+                logger.warning("Error writing player index for %d games: %s", len(batch), e)
+            except Exception as e:
+                logger.exception("Error indexing %d games for the player index: %s", len(batch), e)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, batch: dict) -> int:
+        """
+        Replace the rows of every game in batch ({gamePk: (date, highlights, plays)})
+        whose highlights changed, in one transaction. Returns the number of games written.
+        """
+        changed = {}
+        for game_pk, (date, highlights, plays) in batch.items():
+            if highlights is None:
+                try:
+                    highlights = top_k_highlights(plays, k=None, min_score=self.min_score)
+                except Exception as e:
+                    # One malformed feed mustn't keep the rest of the batch out of the index
+                    logger.warning("Error ranking plays of gamePk %s for the player index: %s", game_pk, e)
+                    continue
+            signature = self._signature(highlights)
+            with self._cond:
+                if self._indexed.get(game_pk) == signature:
+                    continue
+            changed[game_pk] = (date, highlights, signature)
+        if not changed:
+            return 0
+        rows = []
+        for game_pk, (date, highlights, _) in changed.items():
+            for record in highlights:
+                for role, player in (("batter", record.batter), ("pitcher", record.pitcher)):
+                    if player.id is None:
+                        continue
+                    rows.append((player.id, player.full_name, role, game_pk, date, record.inning,
+                                 None if record.is_top is None else int(record.is_top), record.score,
+                                 record.play_id, record.event_type, record.description))
+        with span("player_index_write"):
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("DELETE FROM player_highlights WHERE game_pk = ?", [(game_pk,) for game_pk in changed])
+                conn.executemany(
+                    "INSERT INTO player_highlights"
+                    " (player_id, player_name, role, game_pk, date, inning, is_top, score, play_id,"
+                    " event_type, description)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        with self._cond:
+            for game_pk, (_, _, signature) in changed.items():
+                self._indexed[game_pk] = signature
+        return len(changed)
+
+    def top_plays(self, player_id: int, k: int = 10, start_date: str = None, end_date: str = None,
+                  role: str = None) -> dict:
+        """
+        Return the player's k highest-scoring highlights, optionally between two dates
+        (inclusive, YYYY-MM-DD) and as batter or pitcher only. Ties go to the later game.
+        """
+        query = ("SELECT player_name, role, game_pk, date, inning, is_top, score, play_id, event_type, description"
+                 " FROM player_highlights WHERE player_id = ?")
+        params = [player_id]
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        if role:
+            query += " AND role = ?"
+            params.append(role)
+        query += " ORDER BY score DESC, date DESC, game_pk DESC, inning LIMIT ?"
+        params.append(k)
+        rows = self._connect().execute(query, params).fetchall()
+        return {
+            "player_id": player_id,
+            "player_name": rows[0][0] if rows else None,
+            "highlights": [
+                {
+                    "game_pk": game_pk,
+                    "date": date,
+                    "role": row_role,
+                    "inning": inning,
+                    "isTop": None if is_top is None else bool(is_top),
+                    "score": score,
+                    "playId": play_id,
+                    "event_type": event_type,
+                    "description": description,
+                }
+                for _, row_role, game_pk, date, inning, is_top, score, play_id, event_type, description in rows
+            ],
+        }
+
+    def stats(self) -> dict:
+        rows, players, games = self._connect().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT player_id), COUNT(DISTINCT game_pk) FROM player_highlights"
+        ).fetchone()
+        return {"rows": rows, "players": players, "games": games}
@@ -0,0 +1,39 @@
+# Gunicorn settings used by app.yaml
+import os
+
+# MLB_PRELOAD=1 (or --preload) imports the app once in the master so workers fork
+# with it already loaded and share its memory; each worker still builds its own
+# Vertex AI client, statsapi sessions, database connections and threads.
+preload_app = os.environ.get("MLB_PRELOAD", "0") == "1"
+
+# Threaded workers, so an open /game-data/live stream holds one thread instead of a
+# whole worker; the worker keeps heartbeating while it streams, so the worker
+# timeout doesn't kill it. The ASGI entrypoint's -k flag overrides the class.
+worker_class = "gthread"
+threads = int(os.environ.get("MLB_GUNICORN_THREADS", "32"))
+
+# Warm-up happens per worker in post_fork, never in the master, so the app itself
+# is imported with MLB_WARMUP=0. The hooks read the mode captured here.
+WARMUP = os.environ.get("MLB_WARMUP", "1")
+os.environ["MLB_WARMUP"] = "0"
+
+def when_ready(server):
+    """
+    With a preloaded app, also import the Vertex AI SDK in the master (seconds of
+    work otherwise repeated by every worker). Only the modules are imported; no
+    client is created before the fork.
+    """
+    if server.cfg.preload_app and WARMUP != "0":
+        from vertex_ai.llm_client import import_sdk
+        import_sdk()
+
+def post_fork(server, worker):
+    """
+    Warm up Vertex AI in each worker right after it is forked. Client state
+    inherited from the master (e.g. with --preload) is discarded at fork, so
+    this builds a fresh client, on a background thread unless MLB_WARMUP=sync.
+    """
+    if WARMUP == "0":
+        return
+    from vertex_ai.summary_gen import warm_up_model
+    warm_up_model(background=WARMUP != "sync")
@@ -1,30 +1,101 @@
-from flask import Flask, make_response, request, jsonify, send_file
+# Imported first so the startup report's "imports" phase covers everything below
+from functions.metrics.startup import log_startup_report, mark_startup
+from flask import Flask, Response, make_response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from datetime import datetime
+import hashlib
 import json
+import logging
 import os
+import queue
+import sqlite3
+import time
 
 # Import your custom functions
-from functions.sched.sched_data import get_schedule_data, extract_game_pk, pull_schedule_data
-from functions.game.game_data import fetch_game_data, get_detailed_data, filter_and_rank_highlights, line_score_report
+from functions.sched.sched_data import (
+    get_schedule_data,
+    get_schedule_range,
+    list_schedule_games,
+    pull_schedule_data,
+    schedule_data_for_game,
+    select_game,
+)
+from functions.sched.schedule_index import ScheduleIndex
+from functions.game.game_data import get_detailed_data, build_line_score
+from functions.game.live_tracker import LiveGameTracker
+from functions.game.live_feed import KEEPALIVE_FRAME, KEEPALIVE_INTERVAL, LiveFeedHub, SubscriptionTimeout
+from functions.game.feed_parser import fetch_game_data_projected
+from functions.game.highlight_ranking import top_k_highlights
 from create_files.Article_json import fetch_content_data
+from functions.cache.response_cache import ResponseCache
+from functions.cache.single_flight import SingleFlight
+from functions.store.game_store import GameStore, payload_complete
+from functions.store.player_index import ROLES, PlayerHighlightIndex
+from functions.jobs.job_queue import JobQueue
+from functions.api.encoding import COMPRESSED_BODIES, choose_encoding, encode_json
+from functions.metrics.metrics import (
+    REQUEST_DURATION,
+    count,
+    observe_bytes,
+    register_gauges,
+    render_prometheus,
+    span,
+)
 from vertex_ai.summary_gen import (
-    initialize_vertex_ai,
     generate_detailed_summary,
     generate_concise_summary,
-    generate_game_summary,
+    generate_summaries,
+    stream_game_summary,
+    warm_up_model,
+    LLM_LIMITER,
 )
+mark_startup("imports")
+
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Frontend origin allowed to call /game-data (also used by the ASGI app in asgi.py)
+CORS_ORIGIN = "https://mlb-final.uk.r.appspot.com"
+
 # Configure CORS for frontend access
 CORS(app, resources={
     r"/game-data": {
-        "origins": ["https://mlb-final.uk.r.appspot.com"],
+        "origins": [CORS_ORIGIN],
         "methods": ["GET", "OPTIONS"],  # Include OPTIONS for preflight requests
         "allow_headers": ["Content-Type", "Accept", "Origin"],
         "expose_headers": ["Content-Type"],
         "supports_credentials": True
+    },
+    r"/game-data/stream": {
+        "origins": [CORS_ORIGIN],
+        "methods": ["GET", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Accept", "Origin"],
+        "expose_headers": ["Content-Type"],
+        "supports_credentials": True
+    },
+    r"/slate": {
+        "origins": [CORS_ORIGIN],
+        "methods": ["GET", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Accept", "Origin"],
+        "expose_headers": ["Content-Type"],
+        "supports_credentials": True
+    },
+    r"/player-highlights": {
+        "origins": [CORS_ORIGIN],
+        "methods": ["GET", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Accept", "Origin"],
+        "expose_headers": ["Content-Type"],
+        "supports_credentials": True
+    },
+    r"/summary-jobs/*": {
+        "origins": [CORS_ORIGIN],
+        "methods": ["GET", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Accept", "Origin"],
+        "expose_headers": ["Content-Type"],
+        "supports_credentials": True
     }
 })
 
@@ -32,6 +103,118 @@ CORS(app, resources={
 #OUTPUT_DIR = r"none"
 #os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Run independent pipeline stages (feed/content fetches, LLM calls) in parallel.
+# Set MLB_CONCURRENT_PIPELINE=0 to fall back to the sequential path.
+CONCURRENT_PIPELINE = os.environ.get("MLB_CONCURRENT_PIPELINE", "1") != "0"
+
+# Per-stage timeouts in seconds for the concurrent pipeline
+STAGE_TIMEOUTS = {
+    "game_feed": float(os.environ.get("MLB_TIMEOUT_GAME_FEED", "10")),
+    "content": float(os.environ.get("MLB_TIMEOUT_CONTENT", "5")),
+    "summary": float(os.environ.get("MLB_TIMEOUT_SUMMARY", "30")),
+}
+
+# Shared pool for pipeline stages. A /game-data build or a streamed build holds up
+# to three workers at once (live feed, content, summaries); /slate runs up to
+# MLB_SLATE_WORKERS builds at a time on top of that. Stage tasks never submit back
+# to this pool and wait on it.
+PIPELINE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MLB_PIPELINE_WORKERS", "16")),
+    thread_name_prefix="pipeline",
+)
+
+# /slate builds the games of a date on their own pool, so a whole slate can't take
+# over the stage pool its builds submit to; the timeout bounds the whole slate
+SLATE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MLB_SLATE_WORKERS", "8")),
+    thread_name_prefix="slate",
+)
+SLATE_TIMEOUT = float(os.environ.get("MLB_SLATE_TIMEOUT", "60"))
+
+# Seconds a slate's model call queues for LLM_LIMITER admission, so a cold slate is
+# paced to the model rate limit instead of having most of its summaries refused
+SLATE_SUMMARY_WAIT = float(os.environ.get("MLB_SLATE_SUMMARY_WAIT", "15"))
+
+# In-process cache of combined payloads keyed by (date, team_id)
+GAME_DATA_CACHE = ResponseCache(
+    max_entries=int(os.environ.get("MLB_CACHE_MAX_ENTRIES", "512")),
+    max_bytes=int(os.environ.get("MLB_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttls={
+        "Final": None,
+        "Live": float(os.environ.get("MLB_CACHE_LIVE_TTL", "30")),
+        "Preview": float(os.environ.get("MLB_CACHE_PREVIEW_TTL", "300")),
+    },
+)
+
+# Browser/edge cache lifetimes (Cache-Control max-age, seconds) for /game-data by game
+# state. Complete final games (see payload_complete) never change, so they are marked immutable.
+HTTP_MAX_AGE = {
+    "Final": int(os.environ.get("MLB_HTTP_FINAL_MAX_AGE", str(365 * 24 * 3600))),
+    "Live": int(os.environ.get("MLB_HTTP_LIVE_MAX_AGE", "10")),
+    "Preview": int(os.environ.get("MLB_HTTP_PREVIEW_MAX_AGE", "60")),
+}
+
+# Top-level sections of the /game-data payload, selectable with fields=
+PAYLOAD_SECTIONS = frozenset([
+    "date", "your_team_id", "game_pk", "game_info", "detailed_info", "line_score",
+    "highlights", "content_data", "detailed_summary", "concise_summary",
+])
+SUMMARY_SECTIONS = frozenset(["detailed_summary", "concise_summary"])
+
+# Number of top-ranked plays included in the payload
+HIGHLIGHT_COUNT = 5
+
+# Persistent store of built payloads, indexed by gamePk, date and team
+GAME_STORE = GameStore(stale_after={
+    "Live": float(os.environ.get("MLB_CACHE_LIVE_TTL", "30")),
+    "Preview": float(os.environ.get("MLB_CACHE_PREVIEW_TTL", "300")),
+})
+
+# Player id -> highlights of every processed game, for /player-highlights (same SQLite file)
+PLAYER_INDEX = PlayerHighlightIndex(GAME_STORE.path)
+
+# In-memory (date, team_id) -> games index, loaded in bulk and refreshed in the background.
+# Set MLB_SCHEDULE_INDEX=0 to resolve every request with a statsapi schedule call.
+SCHEDULE_INDEX = ScheduleIndex(
+    start_date=os.environ.get("MLB_SCHEDULE_INDEX_START"),
+    end_date=os.environ.get("MLB_SCHEDULE_INDEX_END"),
+    hot_refresh=float(os.environ.get("MLB_SCHEDULE_HOT_REFRESH", "60")),
+    full_refresh=float(os.environ.get("MLB_SCHEDULE_FULL_REFRESH", str(6 * 3600))),
+) if os.environ.get("MLB_SCHEDULE_INDEX", "1") != "0" else None
+
+# Coalesces concurrent builds of the same game (keyed on gamePk)
+GAME_BUILDS = SingleFlight()
+
+# Last feed per in-progress game, kept current with statsapi diff patches
+LIVE_TRACKER = LiveGameTracker(max_games=int(os.environ.get("MLB_LIVE_TRACKER_GAMES", "64")))
+
+# /game-data/live subscriptions: one upstream poller per watched game, fanned out to its viewers
+LIVE_FEEDS = LiveFeedHub(LIVE_TRACKER, highlight_count=HIGHLIGHT_COUNT,
+                         on_update=lambda game_pk, game_stats: index_game_highlights(game_pk, game_stats))
+
+# Background summary generation for /game-data?summaries=async. One job per gamePk;
+# the most recent games run first, and a finished job is reused while a live payload would be.
+SUMMARY_JOBS = JobQueue(
+    workers=int(os.environ.get("MLB_SUMMARY_WORKERS", "4")),
+    max_pending=int(os.environ.get("MLB_SUMMARY_QUEUE_SIZE", "256")),
+    done_ttl=float(os.environ.get("MLB_CACHE_LIVE_TTL", "30")),
+    thread_name_prefix="summaries",
+)
+
+# Cache and coalescing counters are read from the components at scrape time
+register_gauges("mlb_response_cache", "Counters and occupancy of the /game-data response cache.",
+                lambda: {(("stat", name),): value for name, value in GAME_DATA_CACHE.stats().items()})
+register_gauges("mlb_game_builds", "Game builds executed, shared with another request, and in flight.",
+                lambda: {(("stat", name),): value for name, value in GAME_BUILDS.stats().items()})
+register_gauges("mlb_llm_in_flight", "Model calls in flight.",
+                lambda: LLM_LIMITER.stats()["in_flight"])
+register_gauges("mlb_llm_breaker_open", "1 while the model circuit breaker is refusing calls (open or half-open).",
+                lambda: int(LLM_LIMITER.breaker.state != "closed"))
+register_gauges("mlb_summary_jobs", "Background summary jobs by state, and submit/dedup/drop counters.",
+                lambda: {(("stat", name),): value for name, value in SUMMARY_JOBS.stats().items()})
+register_gauges("mlb_live_feeds", "Games being polled for live subscribers, subscribers, polls and events sent.",
+                lambda: {(("stat", name),): value for name, value in LIVE_FEEDS.stats().items()})
+
 def validate_date(date_str: str) -> bool:
     """Validate that the input date string is in the correct format (YYYY-MM-DD)."""
     try:
@@ -40,98 +223,671 @@ def validate_date(date_str: str) -> bool:
     except ValueError:
         return False
 
-def get_combined_game_data(date: str, team_id: int) -> dict:
+def build_combined_data(date: str, team_id: int, game_pk: int, game_info: dict,
+                        game_details: dict, line_score: dict, highlights: list,
+                        content_data: dict) -> dict:
+    """
+    Assemble the combined payload (without summaries) from the individual pipeline stages.
+    This is where the LineScore and PlayRecord records are serialized.
+    """
+    return {
+        "date": date,
+        "your_team_id": team_id,
+        "game_pk": game_pk,
+        "game_info": {
+            "teams": {
+                "home": {
+                    "team_id": game_info.get("home_team_id"),
+                    "score": game_info.get("home_score"),
+                    "record": game_info.get("home_record")
+                },
+                "away": {
+                    "team_id": game_info.get("away_team_id"),
+                    "score": game_info.get("away_score"),
+                    "record": game_info.get("away_record")
+                }
+            },
+            "result": {
+                "winner": game_info.get("winner"),
+                "loser": game_info.get("loser")
+            },
+            "venue": game_info.get("venue"),
+            "content_link": game_info.get("content_link"),
+            "game_state": game_info.get("game_state"),
+            "game_number": game_info.get("game_number")
+        },
+        "detailed_info": game_details,
+        "line_score": line_score.to_dict(),
+        "highlights": [h.to_dict() for h in highlights[:HIGHLIGHT_COUNT]],  # Top 5 highlights
+        "content_data": content_data
+    }
+
+def fetch_game_stats(game_pk: int, game_state: str = None):
+    """
+    Fetch the live feed and derive (game_details, line_score, highlights), with the
+    line score as a LineScore and the highlights as ranked PlayRecords.
+    In-progress games go through LIVE_TRACKER, which only pulls and re-ranks what
+    changed since the last request; other games are streamed through the
+    projection-only parser. Returns None if the feed couldn't be fetched.
+    """
+    if game_state == "Live":
+        state = LIVE_TRACKER.update(game_pk)
+        if state is None:
+            return None
+        with state.lock:
+            game_stats = state.game_details, state.line_score, state.highlights()
+        index_game_highlights(game_pk, game_stats)
+        return game_stats
+
+    return game_stats_from_feed(game_pk, fetch_game_data_projected(game_pk))
+
+def game_stats_from_feed(game_pk: int, detailed_data: dict):
+    """
+    Derive (game_details, line_score, highlights) from a projected feed, or None if
+    it is empty. The plays are also queued for PLAYER_INDEX, which ranks all of
+    them on its writer thread.
+    """
+    if not detailed_data:
+        return None
+    with span("parse_rank", game_pk=game_pk):
+        game_details = get_detailed_data(detailed_data)
+        line_score = build_line_score(detailed_data["liveData"]["linescore"])
+        all_plays = detailed_data["liveData"]["plays"]["allPlays"]
+        highlights = top_k_highlights(all_plays, k=HIGHLIGHT_COUNT)
+    PLAYER_INDEX.submit(game_pk, game_details.get("date"), plays=all_plays)
+    return game_details, line_score, highlights
+
+def index_game_highlights(game_pk: int, game_stats):
+    """Queue a live game's ranked highlights (all of them) for PLAYER_INDEX."""
+    if game_stats:
+        game_details, _, highlights = game_stats
+        PLAYER_INDEX.submit(game_pk, game_details.get("date"), highlights)
+
+def build_prompts(combined_data: dict):
+    """Return the (detailed, concise) summary prompts for a combined payload."""
+    with span("prompt_build"):
+        return generate_detailed_summary(combined_data), generate_concise_summary(combined_data)
+
+def _stage_result(future, stage: str, default=None):
+    """Wait for a pipeline stage within its timeout, returning default on timeout or failure."""
+    try:
+        return future.result(timeout=STAGE_TIMEOUTS[stage])
+    except FutureTimeoutError:
+        logger.warning("Stage '%s' timed out after %ss", stage, STAGE_TIMEOUTS[stage])
+        count("stage_timeout", stage=stage)
+    except Exception as e:
+        logger.warning("Stage '%s' failed: %s", stage, e)
+        count("stage_error", stage=stage)
+    return default
+
+def get_combined_game_data(date: str, team_id: int, concurrent: bool = None, game_number: int = None,
+                           summaries: bool = True, content: bool = True) -> dict:
     """
     Core function to fetch and combine all game data.
     Used by both file storage and JSON response functions.
+
+    game_number selects the game of a doubleheader (1 or 2); by default the
+    team's first game on the date is used.
+
+    With summaries=False a game that has to be built is returned without its
+    summaries (see submit_summary_job), and content=False skips the content fetch
+    (content_data is None); such partial payloads are neither cached nor stored.
+
+    Results are served from GAME_DATA_CACHE when possible, then from GAME_STORE.
+    Final games stay cached until evicted; live and preview games, and payloads
+    missing a summary or the content, expire after a short TTL so they are rebuilt. Every freshly
+    built payload is written to GAME_STORE.
+
+    The gamePk comes from SCHEDULE_INDEX when the date is indexed, so most requests
+    make no schedule call. Concurrent requests that resolve to the same gamePk
+    (including fans of both teams) share a single build through GAME_BUILDS.
     """
+    cache_key = (date, team_id, game_number)
+    cached = GAME_DATA_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    games = SCHEDULE_INDEX.lookup(date, team_id) if SCHEDULE_INDEX is not None else None
+    if games is None:
+        # Date not indexed: try the store by (date, team_id) before asking statsapi
+        stored = _find_stored(date, team_id, game_number)
+        if stored:
+            combined_data = dict(stored, date=date, your_team_id=team_id)
+            _cache_game_data(cache_key, combined_data)
+            return combined_data
+
+    try:
+        game_pk, schedule_data = resolve_game(date, team_id, game_number, games)
+        if not game_pk:
+            logger.info("No gamePk extracted from schedule data for date: %s and team_id: %s", date, team_id)
+            return None
+
+        stored = _get_stored(game_pk) if games is not None else None
+        if stored:
+            combined_data = dict(stored, date=date, your_team_id=team_id)
+            _cache_game_data(cache_key, combined_data)
+            return combined_data
+
+        if summaries:
+            combined_data = build_game_data(date, team_id, game_pk, schedule_data, concurrent, content)
+        else:
+            combined_data = build_stats_data(date, team_id, game_pk, schedule_data, content)
+    except Exception as e:
+        logger.exception("Error fetching and combining game data: %s", e)
+        return None
+    if not combined_data or not (summaries and content):
+        return combined_data
+
     try:
-        # Fetch schedule data
+        GAME_STORE.put(combined_data)
+    except sqlite3.Error as e:
+        logger.warning("Error writing game store: %s", e)
+    _cache_game_data(cache_key, combined_data)
+    return combined_data
+
+def resolve_game(date: str, team_id: int, game_number: int = None, games: list = None):
+    """
+    Resolve (date, team_id, game_number) to (game_pk, schedule_data) where
+    schedule_data holds only that game. Uses the given schedule games (from
+    SCHEDULE_INDEX) or falls back to a statsapi schedule call. Returns (None, None)
+    if the team has no such game.
+    """
+    if games is None:
         schedule_data = get_schedule_data(date, team_id)
-        print("Schedule Data:", json.dumps(schedule_data, indent=4))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Schedule Data: %s", json.dumps(schedule_data, indent=4))
         if not schedule_data:
+            return None, None
+        games = list_schedule_games(schedule_data)
+    game = select_game(games, game_number)
+    if not game:
+        return None, None
+    return game["gamePk"], schedule_data_for_game(date, game)
+
+def _find_stored(date: str, team_id: int, game_number: int = None) -> dict:
+    try:
+        stored = GAME_STORE.find(date, team_id)
+    except sqlite3.Error as e:
+        logger.warning("Error reading game store: %s", e)
+        return None
+    for combined_data in stored:
+        if game_number is None or combined_data["game_info"].get("game_number", 1) == game_number:
+            count("game_store_hit")
+            return combined_data
+    count("game_store_miss")
+    return None
+
+def _get_stored(game_pk: int) -> dict:
+    try:
+        stored = GAME_STORE.get(game_pk, fresh_only=True)
+    except sqlite3.Error as e:
+        logger.warning("Error reading game store: %s", e)
+        return None
+    count("game_store_hit" if stored else "game_store_miss")
+    return stored
+
+def _cache_game_data(cache_key: tuple, combined_data: dict):
+    game_state = combined_data["game_info"].get("game_state")
+    if not payload_complete(combined_data):
+        # Don't pin a degraded payload (a summary or the content missing) for a final game
+        game_state = "Live"
+    GAME_DATA_CACHE.put(cache_key, combined_data, game_state)
+
+def has_summaries(combined_data: dict) -> bool:
+    """True if both LLM summaries were generated for the payload."""
+    return bool(combined_data.get("detailed_summary") and combined_data.get("concise_summary"))
+
+def build_game_data(date: str, team_id: int, game_pk: int, schedule_data: dict, concurrent: bool = None,
+                    content: bool = True, summary_wait: float = 0) -> dict:
+    """
+    Build the combined payload for a game whose schedule entry is already known.
+    content=False skips the content fetch (content_data is None). Concurrent builds
+    of the same gamePk (and content) are coalesced. summary_wait is how long each
+    model call queues for LLM_LIMITER admission (0: refused right away).
+    Returns None on failure.
+    """
+    if concurrent is None:
+        concurrent = CONCURRENT_PIPELINE
+    build_game = _build_game_data_concurrent if concurrent else _build_game_data_sequential
+    game_data = GAME_BUILDS.do((game_pk, content), build_game, date, team_id, game_pk, schedule_data,
+                               content, summary_wait)
+    if not game_data:
+        return None
+    # The build may have been shared with another requester, so set this request's fields on a copy
+    return dict(game_data, date=date, your_team_id=team_id)
+
+def payload_etag(game_pk: int, body: bytes) -> str:
+    """Strong validator for a /game-data body: the gamePk plus a hash of the exact bytes sent."""
+    return f"{game_pk}-{hashlib.sha1(body).hexdigest()[:20]}"
+
+def cache_control_for(combined_data: dict, complete: bool = None) -> str:
+    """
+    Cache-Control for a /game-data response. Final games whose every stage succeeded
+    are immutable; anything that can still change (live or preview games, a missing
+    summary or content) gets its state's short max-age, and a response tracking a
+    summary job isn't reused. complete overrides the payload_complete check (for
+    responses that leave some sections out, see is_complete).
+    """
+    if "summary_job" in combined_data:
+        return "no-cache"
+    if complete is None:
+        complete = payload_complete(combined_data)
+    game_state = combined_data["game_info"].get("game_state")
+    if game_state == "Final" and complete:
+        return f"public, max-age={HTTP_MAX_AGE['Final']}, immutable"
+    if game_state == "Preview":
+        return f"public, max-age={HTTP_MAX_AGE['Preview']}"
+    return f"public, max-age={HTTP_MAX_AGE['Live']}"
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+def parse_fields(fields: str) -> frozenset:
+    """
+    Parse a fields= parameter ("game_info,line_score") into a set of payload sections.
+    Returns None (every section) for an empty value; raises ValueError on unknown names.
+    """
+    if not fields:
+        return None
+    sections = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = sections - PAYLOAD_SECTIONS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return sections
+
+def render_game_data(combined_data: dict, sections: frozenset = None, accept_encoding: str = None,
+                     if_none_match: str = None):
+    """
+    Serialize a /game-data payload: keep only the requested sections, encode it with
+    orjson, and compress it as negotiated from Accept-Encoding (compressed bodies are
+    reused by ETag). Returns (status, headers, body); status is 304 with an empty body
+    when if_none_match already names this representation.
+    """
+    cache_control = cache_control_for(combined_data, is_complete(combined_data, sections))
+    body = encode_json(project_sections(combined_data, sections))
+    return render_json(body, payload_etag(combined_data.get("game_pk"), body), cache_control,
+                       accept_encoding, if_none_match)
+
+def is_complete(combined_data: dict, sections: frozenset = None) -> bool:
+    """True if every stage behind the requested sections (all of them by default) succeeded."""
+    if sections is None:
+        return payload_complete(combined_data)
+    if sections & SUMMARY_SECTIONS and not has_summaries(combined_data):
+        return False
+    return "content_data" not in sections or bool(combined_data.get("content_data"))
+
+def project_sections(combined_data: dict, sections: frozenset = None) -> dict:
+    """Keep only the requested payload sections (and a summary_job reference)."""
+    if sections is None:
+        return combined_data
+    return {key: value for key, value in combined_data.items() if key in sections or key == "summary_job"}
+
+def render_json(body: bytes, etag: str, cache_control: str, accept_encoding: str = None,
+                if_none_match: str = None):
+    """
+    Headers and (possibly compressed) body for an encoded JSON response with a
+    strong etag, as (status, headers, body); a 304 when if_none_match matches.
+    """
+    encoding = choose_encoding(accept_encoding, len(body))
+    if encoding:
+        # Each content coding is its own representation with its own strong validator
+        etag = f"{etag}-{encoding}"
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, etag):
+        return 304, headers, b""
+    if encoding:
+        body = COMPRESSED_BODIES.compress(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    headers["Content-Type"] = "application/json"
+    return 200, headers, body
+
+def build_stats_data(date: str, team_id: int, game_pk: int, schedule_data: dict, content: bool = True) -> dict:
+    """
+    Build the combined payload for a game without the summaries, fetching the live
+    feed and (unless content=False) the content in parallel. Concurrent builds are
+    coalesced. Returns None on failure.
+    """
+    game_data = GAME_BUILDS.do(("stats", game_pk, content), _build_stats_data,
+                               date, team_id, game_pk, schedule_data, content)
+    if not game_data:
+        return None
+    return dict(game_data, date=date, your_team_id=team_id)
+
+def _build_stats_data(date: str, team_id: int, game_pk: int, schedule_data: dict, content: bool = True) -> dict:
+    try:
+        game_info = pull_schedule_data(schedule_data)
+        stats_future = PIPELINE_EXECUTOR.submit(fetch_game_stats, game_pk, game_info.get("game_state"))
+        content_future = PIPELINE_EXECUTOR.submit(fetch_content_data, game_pk) if content else None
+
+        game_stats = _stage_result(stats_future, "game_feed")
+        if not game_stats:
+            if content_future is not None:
+                content_future.cancel()
             return None
+        game_details, line_score, highlights = game_stats
+        content_data = _stage_result(content_future, "content", default={}) if content else None
+        combined_data = build_combined_data(date, team_id, game_pk, game_info,
+                                            game_details, line_score, highlights, content_data)
+        combined_data["detailed_summary"] = None
+        combined_data["concise_summary"] = None
+        return combined_data
+    except Exception as e:
+        logger.exception("Error fetching and combining game data: %s", e)
+        return None
 
-        # Extract game_pk and basic game info
-        game_pk = extract_game_pk(schedule_data)
-        if not game_pk:
-            print("No gamePk extracted from schedule data for date:", date, "and team_id:", team_id)
+def submit_summary_job(combined_data: dict):
+    """
+    Queue generation of the summaries for a payload built without them.
+    Jobs are deduplicated per gamePk and games on later dates are generated first.
+    """
+    priority = datetime.strptime(combined_data["date"], "%Y-%m-%d").toordinal()
+    return SUMMARY_JOBS.submit(combined_data["game_pk"], run_summary_job, combined_data, priority=priority)
+
+def run_summary_job(combined_data: dict) -> dict:
+    """
+    Summary job body: generate both summaries for a payload and write the completed
+    payload to GAME_STORE, where later /game-data requests pick it up (unless the
+    content fetch was skipped, in which case only the summary cache is warmed).
+    Returns {"detailed_summary": ..., "concise_summary": ...}.
+    """
+    summaries = generate_summaries(combined_data)
+    completed = dict(combined_data, **summaries)
+    if not has_summaries(completed):
+        raise RuntimeError("The model returned an empty summary")
+    if completed.get("content_data") is None:
+        return summaries
+    try:
+        GAME_STORE.put(completed)
+    except sqlite3.Error as e:
+        logger.warning("Error writing game store: %s", e)
+    return summaries
+
+def summary_job_info(job) -> dict:
+    """The summary_job section of a /game-data?summaries=async response."""
+    return {"id": job.id, "status": job.status, "status_url": f"/summary-jobs/{job.id}"}
+
+def _build_game_data_concurrent(date: str, team_id: int, game_pk: int, schedule_data: dict,
+                                content: bool = True, summary_wait: float = 0) -> dict:
+    """
+    Build the payload for one game with independent stages in parallel.
+
+    The live feed and content fetches run in parallel, and the summaries are
+    generated (in one combined model call, see generate_summaries) while the content
+    fetch finishes, so latency follows the critical path instead of the sum of all stages.
+    """
+    try:
+        # The live feed and the content fetch only need game_pk
+        game_info = pull_schedule_data(schedule_data)
+        stats_future = PIPELINE_EXECUTOR.submit(fetch_game_stats, game_pk, game_info.get("game_state"))
+        content_future = PIPELINE_EXECUTOR.submit(fetch_content_data, game_pk) if content else None
+
+        # Fetch detailed game data
+        game_stats = _stage_result(stats_future, "game_feed")
+        if not game_stats:
+            if content_future is not None:
+                content_future.cancel()
             return None
+        game_details, line_score, highlights = game_stats
+
+        # The prompts don't use content data, so summaries can start before it arrives
+        combined_data = build_combined_data(date, team_id, game_pk, game_info,
+                                            game_details, line_score, highlights, {})
+
+        # Generate summaries using Vertex AI
+        summaries_future = PIPELINE_EXECUTOR.submit(generate_summaries, combined_data, parallel=True,
+                                                   wait=summary_wait)
+
+        combined_data["content_data"] = _stage_result(content_future, "content", default={}) if content else None
+        summaries = _stage_result(summaries_future, "summary", default={})
+        combined_data["detailed_summary"] = summaries.get("detailed_summary")
+        combined_data["concise_summary"] = summaries.get("concise_summary")
+
+        return combined_data
+    except Exception as e:
+        logger.exception("Error fetching and combining game data: %s", e)
+        return None
+
+def _build_game_data_sequential(date: str, team_id: int, game_pk: int, schedule_data: dict,
+                                content: bool = True, summary_wait: float = 0) -> dict:
+    """Build the payload for one game with every stage run one after another (MLB_CONCURRENT_PIPELINE=0)."""
+    try:
         game_info = pull_schedule_data(schedule_data)
 
         # Fetch detailed game data
-        detailed_data = fetch_game_data(game_pk)
-        if not detailed_data:
+        game_stats = fetch_game_stats(game_pk, game_info.get("game_state"))
+        if not game_stats:
             return None
-        game_details = get_detailed_data(detailed_data)
-        line_score = line_score_report(detailed_data["liveData"]["linescore"])
-        all_plays = detailed_data["liveData"]["plays"]["allPlays"]
-        highlights = filter_and_rank_highlights(all_plays)
+        game_details, line_score, highlights = game_stats
 
         # Fetch content data (Article)
-        content_data = fetch_content_data(game_pk)
+        content_data = fetch_content_data(game_pk) if content else None
 
         # Combine all data
-        combined_data = {
-            "date": date,
-            "your_team_id": team_id,
-            "game_pk": game_pk,
-            "game_info": {
-                "teams": {
-                    "home": {
-                        "team_id": game_info.get("home_team_id"),
-                        "score": game_info.get("home_score"),
-                        "record": game_info.get("home_record")
-                    },
-                    "away": {
-                        "team_id": game_info.get("away_team_id"),
-                        "score": game_info.get("away_score"),
-                        "record": game_info.get("away_record")
-                    }
-                },
-                "result": {
-                    "winner": game_info.get("winner"),
-                    "loser": game_info.get("loser")
-                },
-                "venue": game_info.get("venue"),
-                "content_link": game_info.get("content_link")
-            },
-            "detailed_info": game_details,
-            "line_score": line_score,
-            "highlights": highlights[:5],  # Top 5 highlights
-            "content_data": content_data
-        }
+        combined_data = build_combined_data(date, team_id, game_pk, game_info,
+                                            game_details, line_score, highlights, content_data)
 
         # Generate summaries using Vertex AI
-        initialize_vertex_ai()
-        detailed_prompt = generate_detailed_summary(combined_data)
-        concise_prompt = generate_concise_summary(combined_data)
-        detailed_summary = generate_game_summary(detailed_prompt)
-        concise_summary = generate_game_summary(concise_prompt)
-        combined_data["detailed_summary"] = detailed_summary
-        combined_data["concise_summary"] = concise_summary
+        combined_data.update(generate_summaries(combined_data, wait=summary_wait))
 
         return combined_data
     except Exception as e:
-        print(f"Error fetching and combining game data: {str(e)}")
+        logger.exception("Error fetching and combining game data: %s", e)
         return None
 
+def stream_combined_game_data(date: str, team_id: int, game_number: int = None):
+    """
+    Yield the combined payload section by section as each one becomes available.
+
+    Events are dicts of the form {"event": "section", "name": ..., "data": ...} for
+    complete sections, {"event": "delta", "name": ..., "text": ...} for summary
+    chunks as the model streams them, then a final {"event": "done"} (or
+    {"event": "error", "message": ...}). The stats sections arrive before either
+    summary starts, so time to first content doesn't depend on LLM latency.
+
+    A payload in GAME_DATA_CACHE or GAME_STORE is sent as sections right away, as
+    get_combined_game_data would serve it; a streamed build is stored once both
+    summaries are in.
+    """
+    cache_key = (date, team_id, game_number)
+    cached = GAME_DATA_CACHE.get(cache_key)
+    games = SCHEDULE_INDEX.lookup(date, team_id) if SCHEDULE_INDEX is not None and cached is None else None
+    stored = None
+    if cached is None and games is None:
+        # Date not indexed: try the store by (date, team_id) before asking statsapi
+        stored = _find_stored(date, team_id, game_number)
+    if cached is None and not stored:
+        game_pk, schedule_data = resolve_game(date, team_id, game_number, games)
+        if not game_pk:
+            yield {"event": "error", "message": "No game data found"}
+            return
+        stored = _get_stored(game_pk) if games is not None else None
+    if stored:
+        cached = dict(stored, date=date, your_team_id=team_id)
+        _cache_game_data(cache_key, cached)
+    if cached is not None:
+        for name, data in cached.items():
+            yield {"event": "section", "name": name, "data": data}
+        yield {"event": "done"}
+        return
+
+    events = queue.Queue()
+    game_info = pull_schedule_data(schedule_data)
+    stats_future = PIPELINE_EXECUTOR.submit(fetch_game_stats, game_pk, game_info.get("game_state"))
+    content_future = PIPELINE_EXECUTOR.submit(fetch_content_data, game_pk)
+
+    game_stats = _stage_result(stats_future, "game_feed")
+    if not game_stats:
+        content_future.cancel()
+        yield {"event": "error", "message": "Could not fetch detailed game data"}
+        return
+    game_details, line_score, highlights = game_stats
+    combined_data = build_combined_data(date, team_id, game_pk, game_info,
+                                        game_details, line_score, highlights, {})
+
+    for name in ("date", "your_team_id", "game_pk", "game_info", "detailed_info", "line_score", "highlights"):
+        yield {"event": "section", "name": name, "data": combined_data[name]}
+
+    def stream_summary(name, prompt):
+        parts = []
+        try:
+            for text in stream_game_summary(prompt):
+                parts.append(text)
+                events.put({"event": "delta", "name": name, "text": text})
+            events.put({"event": "section", "name": name, "data": "".join(parts)})
+        except Exception as e:
+            logger.warning("Error streaming %s: %s", name, e)
+            events.put({"event": "section", "name": name, "data": None})
+
+    detailed_prompt, concise_prompt = build_prompts(combined_data)
+    producers = [
+        PIPELINE_EXECUTOR.submit(stream_summary, "detailed_summary", detailed_prompt),
+        PIPELINE_EXECUTOR.submit(stream_summary, "concise_summary", concise_prompt),
+    ]
+
+    # Wait for content here rather than on a pool worker; summary deltas queue up
+    # meanwhile. Content was fetched alongside the live feed, so this is usually done.
+    combined_data["content_data"] = _stage_result(content_future, "content", default={})
+    yield {"event": "section", "name": "content_data", "data": combined_data["content_data"]}
+
+    remaining = len(producers)
+    while remaining:
+        try:
+            event = events.get(timeout=STAGE_TIMEOUTS["summary"])
+        except queue.Empty:
+            yield {"event": "error", "message": "Timed out waiting for remaining sections"}
+            return
+        if event["event"] == "section":
+            combined_data[event["name"]] = event["data"]
+            remaining -= 1
+        yield event
+
+    if has_summaries(combined_data):
+        try:
+            GAME_STORE.put(combined_data)
+        except sqlite3.Error as e:
+            logger.warning("Error writing game store: %s", e)
+        _cache_game_data(cache_key, combined_data)
+    yield {"event": "done"}
+
+def list_slate_games(date: str) -> list:
+    """
+    Every game on date once (by gamePk), from SCHEDULE_INDEX when the date is
+    indexed or else one statsapi schedule call for the whole date. Returns None if
+    the schedule couldn't be fetched.
+    """
+    games = SCHEDULE_INDEX.games_on(date) if SCHEDULE_INDEX is not None else None
+    if games is None:
+        schedule_data = get_schedule_range(date, date)
+        if not schedule_data:
+            return None
+        games = list_schedule_games(schedule_data)
+    unique = {}
+    for game in games:
+        # A suspended game can be listed again on the date it is resumed
+        if game.get("gamePk") and game["gamePk"] not in unique:
+            unique[game["gamePk"]] = game
+    return list(unique.values())
+
+def get_slate_game(date: str, game: dict, summaries: bool = True, content: bool = True) -> dict:
+    """
+    Payload for one game of a slate, with the home team as your_team_id: served from
+    GAME_STORE when fresh, else built (sharing any build in flight for the gamePk)
+    and stored. summaries and content work as for get_combined_game_data. Model
+    calls queue up to SLATE_SUMMARY_WAIT seconds for admission, so the builds of a
+    cold slate are paced to the model rate limit rather than refused.
+    """
+    game_pk = game["gamePk"]
+    team_id = game["teams"]["home"]["team"]["id"]
+    stored = _get_stored(game_pk)
+    if stored:
+        return dict(stored, date=date, your_team_id=team_id)
+    schedule_data = schedule_data_for_game(date, game)
+    if not summaries:
+        return build_stats_data(date, team_id, game_pk, schedule_data, content)
+    combined_data = build_game_data(date, team_id, game_pk, schedule_data, content=content,
+                                    summary_wait=SLATE_SUMMARY_WAIT)
+    if combined_data and content:
+        try:
+            GAME_STORE.put(combined_data)
+        except sqlite3.Error as e:
+            logger.warning("Error writing game store: %s", e)
+    return combined_data
+
+def iter_slate(date: str, games: list, summaries: bool = True, content: bool = True):
+    """
+    Build the slate's games on SLATE_EXECUTOR and yield (game_pk, combined_data, error)
+    as each finishes. A game that fails is yielded with combined_data None and an
+    error of "unavailable" (no payload could be built), "failed: <reason>" or, for
+    games not finished within SLATE_TIMEOUT, "timeout"; the others are unaffected.
+    Games not started yet are cancelled if the caller stops early.
+    """
+    futures = {SLATE_EXECUTOR.submit(get_slate_game, date, game, summaries, content): game["gamePk"]
+               for game in games}
+    try:
+        for future in as_completed(futures, timeout=SLATE_TIMEOUT):
+            game_pk = futures[future]
+            try:
+                combined_data = future.result()
+            except Exception as e:
+                logger.warning("Error building gamePk %s for the %s slate: %s", game_pk, date, e)
+                count("slate_game_error", reason="failed")
+                yield game_pk, None, f"failed: {e}"
+                continue
+            if not combined_data:
+                count("slate_game_error", reason="unavailable")
+                yield game_pk, None, "unavailable"
+                continue
+            yield game_pk, combined_data, None
+    except FutureTimeoutError:
+        for future, game_pk in futures.items():
+            if not future.done():
+                logger.warning("Slate for %s: gamePk %s not built within %ss", date, game_pk, SLATE_TIMEOUT)
+                count("slate_game_error", reason="timeout")
+                yield game_pk, None, "timeout"
+    finally:
+        for future in futures:
+            future.cancel()
+
+def slate_cache_control(games: list, errors: list, sections: frozenset = None) -> str:
+    """Cache-Control for a slate: that of its least settled game, and no-cache if a game is missing."""
+    if errors:
+        return "no-cache"
+    if not games:
+        return cache_control_for({"game_info": {"game_state": "Preview"}}, complete=False)
+    controls = {cache_control_for(game, is_complete(game, sections)) for game in games}
+    for game_state in ("Live", "Preview"):
+        control = cache_control_for({"game_info": {"game_state": game_state}}, complete=False)
+        if control in controls:
+            return control
+    return cache_control_for({"game_info": {"game_state": "Final"}}, complete=True)
+
 def process_game_data(date: str, team_id: int) -> str:
     """
-    Process game data and save to file.
+    Process game data and save it to the game store.
     Used for storage and other functions that need file access.
-    Returns the path to the output file.
+    Returns the path to the store file.
     """
     combined_data = get_combined_game_data(date, team_id)
     if not combined_data:
         return None
 
-    # Save to output.json (overwrites on each request)
-   # output_file_path = os.path.join(OUTPUT_DIR, "output.json")
-    #with open(output_file_path, "w") as f:
-    #    json.dump(combined_data, f, indent=4)
-
-    #return output_file_path
+    # get_combined_game_data writes every built payload to GAME_STORE
+    return GAME_STORE.path
 
 def process_game_data_json(date: str, team_id: int) -> dict:
     """
@@ -140,12 +896,61 @@ def process_game_data_json(date: str, team_id: int) -> dict:
     """
     return get_combined_game_data(date, team_id)
 
+mark_startup("app_setup")
+
+# Import the Vertex AI SDK, initialize it and build the model when the app loads
+# rather than on the first summary. By default this runs on a background thread, so
+# requests that need no summary are served while it loads; MLB_WARMUP=sync blocks
+# until the model is ready, and MLB_WARMUP=0 skips it (e.g. for offline tooling).
+# Under gunicorn, gunicorn.conf.py warms up each worker after the fork instead.
+WARMUP = os.environ.get("MLB_WARMUP", "1")
+if WARMUP != "0":
+    warm_up_model(background=WARMUP != "sync")
+log_startup_report("app loaded")
+
+@app.before_request
+def start_request_timer():
+    request.environ["mlb.started"] = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Record request latency by route, and the response size when it is known up front."""
+    started = request.environ.get("mlb.started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        REQUEST_DURATION.observe(time.perf_counter() - started, route=route, status=response.status_code)
+    if not response.is_streamed:
+        observe_bytes("response", response.calculate_content_length())
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Stage latency histograms, payload sizes and cache counters in the Prometheus text format."""
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats_endpoint():
+    """Hit/miss counters and occupancy of the /game-data response cache and game store."""
+    stats = GAME_DATA_CACHE.stats()
+    stats["summary_jobs"] = SUMMARY_JOBS.stats()
+    stats["llm_limiter"] = LLM_LIMITER.stats()
+    stats["live_feeds"] = LIVE_FEEDS.stats()
+    for name, store in (("game_store", GAME_STORE), ("player_index", PLAYER_INDEX)):
+        try:
+            stats[name] = store.stats()
+        except sqlite3.Error as e:
+            logger.warning("Error reading %s stats: %s", name, e)
+            stats[name] = {"error": str(e)}
+    if SCHEDULE_INDEX is not None:
+        stats["schedule_index"] = SCHEDULE_INDEX.stats()
+    return jsonify(stats)
+
 @app.route("/game-data", methods=["GET", "OPTIONS"])
 def game_data_endpoint():
     if request.method == "OPTIONS":
         # Handle preflight request
         response = make_response()
-        response.headers.add("Access-Control-Allow-Origin", "https://mlb-final.uk.r.appspot.com")
+        response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
         response.headers.add("Access-Control-Allow-Headers", "Content-Type,Accept,Origin")
         response.headers.add("Access-Control-Allow-Methods", "GET,OPTIONS")
         return response
@@ -153,23 +958,227 @@ def game_data_endpoint():
     # Your existing endpoint code here...
     date = request.args.get("date")
     team_id = request.args.get("team_id")
+    game_number = request.args.get("game_number")
+    # summaries=async answers with the stats sections right away and a summary job to poll
+    async_summaries = request.args.get("summaries") == "async"
     
     if not date or not team_id:
         return jsonify({"error": "Please select a date and team first"}), 400
 
     try:
-        combined_data = get_combined_game_data(date, int(team_id))
+        # fields= limits the response to some sections; unrequested stages aren't run
+        sections = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    want_summaries = sections is None or bool(sections & SUMMARY_SECTIONS)
+    want_content = sections is None or "content_data" in sections
+
+    try:
+        combined_data = get_combined_game_data(date, int(team_id),
+                                               game_number=int(game_number) if game_number else None,
+                                               summaries=want_summaries and not async_summaries,
+                                               content=want_content)
         
         if not combined_data:
             return jsonify({"error": "No game data found"}), 404
 
-        response = jsonify(combined_data)
-        response.headers.add("Access-Control-Allow-Origin", "https://mlb-final.uk.r.appspot.com")
+        if async_summaries and want_summaries and not has_summaries(combined_data):
+            combined_data = dict(combined_data, summary_job=summary_job_info(submit_summary_job(combined_data)))
+
+        # A client that already has this representation gets an empty 304
+        status, headers, body = render_game_data(combined_data, sections,
+                                                 request.headers.get("Accept-Encoding"),
+                                                 request.headers.get("If-None-Match"))
+        response = Response(body, status=status, headers=headers)
+        response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
         return response
 
     except Exception as e:
-        print(f"Error processing game data: {str(e)}")
+        logger.exception("Error processing game data: %s", e)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/slate", methods=["GET"])
+def slate_endpoint():
+    """
+    Every game on a date, built in parallel from one schedule lookup. Responds with
+    {"date", "games": [payloads in schedule order], "errors": [{"game_pk", "error"}]};
+    a game that can't be built is listed under errors instead of failing the slate.
+    fields= limits each payload's sections as for /game-data. With stream=1 the
+    response is newline-delimited JSON instead: a "schedule" event with the gamePks,
+    a "game" or "error" event per game as it finishes, then "done".
+    """
+    date = request.args.get("date")
+    if not date or not validate_date(date):
+        return jsonify({"error": "Please provide a date in YYYY-MM-DD format"}), 400
+    try:
+        sections = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    summaries = sections is None or bool(sections & SUMMARY_SECTIONS)
+    content = sections is None or "content_data" in sections
+
+    games = list_slate_games(date)
+    if games is None:
+        return jsonify({"error": "Schedule unavailable"}), 502
+    game_pks = [game["gamePk"] for game in games]
+
+    if request.args.get("stream") == "1":
+        def generate():
+            yield encode_json({"event": "schedule", "date": date, "game_pks": game_pks}) + b"\n"
+            built = failed = 0
+            for game_pk, combined_data, error in iter_slate(date, games, summaries, content):
+                if error:
+                    failed += 1
+                    yield encode_json({"event": "error", "game_pk": game_pk, "error": error}) + b"\n"
+                else:
+                    built += 1
+                    yield encode_json({"event": "game", "game_pk": game_pk,
+                                       "data": project_sections(combined_data, sections)}) + b"\n"
+            yield encode_json({"event": "done", "games": built, "errors": failed}) + b"\n"
+
+        response = Response(generate(), mimetype="application/x-ndjson")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+        return response
+
+    built, errors = {}, []
+    for game_pk, combined_data, error in iter_slate(date, games, summaries, content):
+        if error:
+            errors.append({"game_pk": game_pk, "error": error})
+        else:
+            built[game_pk] = combined_data
+    payloads = [built[game_pk] for game_pk in game_pks if game_pk in built]
+    body = encode_json({
+        "date": date,
+        # Projected entries keep their gamePk so the client can tell the games apart
+        "games": [dict(project_sections(combined_data, sections), game_pk=combined_data["game_pk"])
+                  for combined_data in payloads],
+        "errors": sorted(errors, key=lambda error: game_pks.index(error["game_pk"])),
+    })
+    status, headers, body = render_json(body, f"slate-{date}-{hashlib.sha1(body).hexdigest()[:20]}",
+                                        slate_cache_control(payloads, errors, sections),
+                                        request.headers.get("Accept-Encoding"),
+                                        request.headers.get("If-None-Match"))
+    response = Response(body, status=status, headers=headers)
+    response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+    return response
+
+@app.route("/player-highlights", methods=["GET"])
+def player_highlights_endpoint():
+    """
+    A player's top highlights across every game processed so far, answered from
+    PLAYER_INDEX alone: player_id, optionally k (default 10, at most 100),
+    start_date/end_date (YYYY-MM-DD, inclusive) and role (batter or pitcher).
+    """
+    player_id = request.args.get("player_id", "")
+    if not player_id.isdigit():
+        return jsonify({"error": "Please provide a numeric player_id"}), 400
+    k = request.args.get("k", "10")
+    if not k.isdigit() or not 1 <= int(k) <= 100:
+        return jsonify({"error": "k must be a number from 1 to 100"}), 400
+    dates = []
+    for value in (request.args.get("start_date"), request.args.get("end_date")):
+        if value and not validate_date(value):
+            return jsonify({"error": f"Invalid date format: {value}. Please use YYYY-MM-DD format."}), 400
+        # Indexed dates compare as strings, so "2024-6-1" has to become "2024-06-01"
+        dates.append(datetime.strptime(value, "%Y-%m-%d").date().isoformat() if value else None)
+    start_date, end_date = dates
+    role = request.args.get("role")
+    if role and role not in ROLES:
+        return jsonify({"error": f"role must be one of: {', '.join(ROLES)}"}), 400
+
+    try:
+        with span("player_index_query"):
+            result = PLAYER_INDEX.top_plays(int(player_id), int(k), start_date, end_date, role)
+    except sqlite3.Error as e:
+        logger.warning("Error reading player index: %s", e)
+        return jsonify({"error": "Player index unavailable"}), 503
+    response = jsonify(result)
+    # New games are indexed as they are processed, so answers only stay good briefly
+    response.headers["Cache-Control"] = f"public, max-age={HTTP_MAX_AGE['Live']}"
+    response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+    return response
+
+@app.route("/summary-jobs/<job_id>", methods=["GET"])
+def summary_job_endpoint(job_id):
+    """
+    Status of a summary job from /game-data?summaries=async: queued, running, done
+    (with the summaries under "result"), failed or dropped. Finished jobs are kept
+    for a while, then forgotten (404).
+    """
+    job = SUMMARY_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown summary job"}), 404
+    response = jsonify(dict(job.to_dict(), game_pk=job.key))
+    response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+    return response
+
+@app.route("/game-data/stream", methods=["GET"])
+def game_data_stream_endpoint():
+    """
+    Streaming variant of /game-data. Responds with newline-delimited JSON events
+    (see stream_combined_game_data) so clients can render each section as it arrives.
+    """
+    date = request.args.get("date")
+    team_id = request.args.get("team_id")
+    game_number = request.args.get("game_number")
+
+    if not date or not team_id:
+        return jsonify({"error": "Please select a date and team first"}), 400
+
+    def generate():
+        try:
+            events = stream_combined_game_data(date, int(team_id),
+                                               game_number=int(game_number) if game_number else None)
+            for event in events:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.exception("Error streaming game data: %s", e)
+            yield json.dumps({"event": "error", "message": str(e)}) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    # Keep proxies from buffering the stream
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+    return response
+
+@app.route("/game-data/live", methods=["GET"])
+def game_data_live_endpoint():
+    """
+    Server-sent events for an in-progress game: a "snapshot" with game_state,
+    detailed_info, line_score and highlights, then a "delta" with only the sections
+    that changed each time the game moves on, and "final" when it is over. Every
+    viewer of a game shares one upstream poller (see LiveFeedHub). Each open stream
+    holds a thread of a gthread worker here (see gunicorn.conf.py); the ASGI app
+    serves them from its event loop.
+    """
+    game_pk = request.args.get("game_pk", "")
+    if not game_pk.isdigit():
+        return jsonify({"error": "Please provide a numeric game_pk"}), 400
+
+    subscription = LIVE_FEEDS.subscribe(int(game_pk))
+
+    def generate():
+        try:
+            while True:
+                try:
+                    frame = subscription.get(timeout=KEEPALIVE_INTERVAL)
+                except SubscriptionTimeout:
+                    yield KEEPALIVE_FRAME
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            LIVE_FEEDS.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.headers.add("Access-Control-Allow-Origin", CORS_ORIGIN)
+    return response
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8080)
\ No newline at end of file
@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING
+from functions.replay import upstream_replay
+from functions.metrics.startup import log_startup_report, startup_phase
+
+if TYPE_CHECKING:
+    from vertexai.preview.generative_models import GenerativeModel
+
+logger = logging.getLogger(__name__)
+
+# Process-lifetime Vertex AI state. It is reset in forked children so every
+# gunicorn worker initializes its own client instead of inheriting the parent's.
+_lock = threading.Lock()
+_initialized_pid = None
+_models = {}
+
+# The SDK modules (imported on first use; they take seconds to import). Imported
+# modules survive a fork, so with gunicorn --preload workers inherit them.
+_sdk = None
+_sdk_lock = threading.Lock()
+
+# Vertex AI project settings; the defaults are placeholders for local development
+VERTEX_PROJECT = os.environ.get("VERTEX_PROJECT", "projectId")
+VERTEX_LOCATION = os.environ.get("VERTEX_LOCATION", "location")
+
+def _reset_after_fork():
+    global _initialized_pid, _models
+    _initialized_pid = None
+    _models = {}
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def import_sdk():
+    """
+    Import vertexai and its generative_models module on first use and return both.
+    Safe to call before a fork: importing creates no clients, channels or threads.
+    """
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                with startup_phase("vertexai_import"):
+                    import vertexai
+                    from vertexai.preview import generative_models
+                _sdk = (vertexai, generative_models)
+    return _sdk
+
+def ensure_initialized():
+    """
+    Run vertexai.init once per process; later calls are a cheap no-op.
+    Skipped in replay mode, which never talks to Vertex AI.
+    """
+    global _initialized_pid
+    pid = os.getpid()
+    if _initialized_pid == pid:
+        return
+    with _lock:
+        if _initialized_pid == pid:
+            return
+        if not upstream_replay.is_replaying():
+            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.path.join(os.getcwd(), "cred_path")
+            vertexai, _ = import_sdk()
+            with startup_phase("vertexai_init"):
+                vertexai.init(project=VERTEX_PROJECT, location=VERTEX_LOCATION)
+        _initialized_pid = pid
+
+def _build_model(model_name: str) -> "GenerativeModel":
+    _, generative_models = import_sdk()
+    with startup_phase("model_build"):
+        return generative_models.GenerativeModel(model_name)
+
+def get_model(model_name: str) -> "GenerativeModel":
+    """
+    Return the process-wide GenerativeModel for model_name, creating it on first use.
+    In record/replay mode the model is wrapped in (or replaced by) a ReplayModel.
+    """
+    model = _models.get(model_name)
+    if model is not None and _initialized_pid == os.getpid():
+        return model
+    ensure_initialized()
+    with _lock:
+        model = _models.get(model_name)
+        if model is None:
+            if upstream_replay.is_replaying():
+                model = upstream_replay.ReplayModel(model_name)
+            elif upstream_replay.is_recording():
+                model = upstream_replay.ReplayModel(model_name, _build_model(model_name))
+            else:
+                model = _build_model(model_name)
+            _models[model_name] = model
+    return model
+
+def warm_up(model_name: str) -> bool:
+    """
+    Initialize Vertex AI and construct the model ahead of the first request.
+    Returns False instead of raising so a failed warm-up never blocks boot.
+    """
+    try:
+        get_model(model_name)
+        return True
+    except Exception as e:
+        logger.warning("Vertex AI warm-up failed: %s", e)
+        return False
+
+def warm_up_in_background(model_name: str) -> threading.Thread:
+    """
+    Run warm_up on a daemon thread so the process can serve requests meanwhile.
+    A summary requested before it finishes waits for the same import and init.
+    """
+    thread = threading.Thread(target=_warm_up_and_report, args=(model_name,), name="vertex-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def _warm_up_and_report(model_name: str):
+    if warm_up(model_name):
+        log_startup_report("model ready")
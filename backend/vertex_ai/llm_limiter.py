@@ -0,0 +1,253 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functions.metrics.metrics import count
+
+class LLMUnavailable(Exception):
+    """A model call was refused (breaker open, rate limited, at capacity) or missed its deadline."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Model call not made: {reason}")
+        self.reason = reason
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; each acquire takes one token or is refused."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        return self.acquire(0)
+
+    def acquire(self, timeout: float) -> bool:
+        """Take a token, waiting up to timeout seconds for one to refill."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                delay = (1 - self._tokens) / self.rate
+            if now + delay > deadline:
+                return False
+            time.sleep(delay)
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the last `window` calls. A call fails if it raised, timed
+    out or took longer than slow_call seconds. Once at least min_calls are recorded
+    and the failure ratio reaches failure_ratio, the breaker opens and refuses calls
+    for cooldown seconds; then a single probe call is let through (half-open) and
+    its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, window: int = 20, min_calls: int = 5, failure_ratio: float = 0.5,
+                 slow_call: float = 15, cooldown: float = 30):
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call = slow_call
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window)  # True for a failed call
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = "half_open"
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def cancel_probe(self):
+        """Give back a half-open probe that was admitted but never made."""
+        with self._lock:
+            self._probing = False
+
+    def record(self, elapsed: float, error: bool = False):
+        failed = error or elapsed > self.slow_call
+        with self._lock:
+            if self._state == "half_open":
+                if failed:
+                    self._trip()
+                else:
+                    self._state = "closed"
+                    self._outcomes.clear()
+                self._probing = False
+                return
+            self._outcomes.append(failed)
+            if self._state == "closed" and len(self._outcomes) >= self.min_calls \
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio:
+                self._trip()
+
+    def _trip(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.trips += 1
+
+class ModelLimiter:
+    """
+    Admission control for model calls: a circuit breaker, a token-bucket rate limit
+    and a cap on calls in flight, checked in that order without waiting, plus a
+    deadline on each call. A refused or late call raises LLMUnavailable right away,
+    so callers serve what they have instead of queuing behind a slow model. Batch
+    callers that would rather be paced than refused pass wait=seconds to queue for
+    a token and a slot.
+    """
+
+    def __init__(self, max_in_flight: int, rate: float, burst: int, deadline: float, breaker: CircuitBreaker):
+        self.max_in_flight = max_in_flight
+        self.deadline = deadline
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self.rejected = {}
+
+    def _reject(self, reason: str):
+        with self._lock:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        count("llm_rejected", reason=reason)
+        raise LLMUnavailable(reason)
+
+    def _admit(self, wait: float = 0):
+        if not self.breaker.allow():
+            self._reject("circuit_open")
+        deadline = time.monotonic() + wait
+        if not self.bucket.acquire(wait):
+            self.breaker.cancel_probe()
+            self._reject("rate_limited")
+        remaining = deadline - time.monotonic()
+        if not (self._slots.acquire(timeout=remaining) if remaining > 0 else self._slots.acquire(blocking=False)):
+            self.breaker.cancel_probe()
+            self._reject("at_capacity")
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self, started: float, error: bool, record: bool = True):
+        if record:
+            self.breaker.record(time.monotonic() - started, error)
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # A slot stays taken until its call returns, so the pool never queues work
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="llm")
+                    self._executor_pid = pid
+        return self._executor
+
+    def call(self, fn, *args, wait: float = 0, **kwargs):
+        """
+        Run fn(*args, **kwargs) under the limits; raises LLMUnavailable if refused or
+        late. wait is how long to queue for admission before being refused.
+        """
+        self._admit(wait)
+        started = time.monotonic()
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(started, error=True)
+            raise
+
+        timed_out = threading.Event()
+
+        def done(f):
+            # The slot is held until the call really ends, even after the caller gave up on
+            # it; a call that missed its deadline was already counted against the breaker.
+            self._release(started, error=f.cancelled() or f.exception() is not None,
+                          record=not timed_out.is_set())
+
+        future.add_done_callback(done)
+        try:
+            return future.result(timeout=self.deadline)
+        except FutureTimeoutError:
+            timed_out.set()
+            self.breaker.record(self.deadline, error=True)
+            self._reject("deadline_exceeded")
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) under the limits; the coroutine is cancelled at the deadline."""
+        self._admit()
+        started = time.monotonic()
+        error = True
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), self.deadline)
+            error = False
+            return result
+        except asyncio.TimeoutError:
+            self._reject("deadline_exceeded")
+        finally:
+            self._release(started, error)
+
+    def admit(self):
+        """
+        Admission for a streamed call: returns a context manager that holds a slot
+        while the stream is consumed and records its outcome. The deadline can't cut
+        a chunk short, so the consumer calls check_deadline() as each chunk arrives.
+        """
+        self._admit()
+        return _Admission(self)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "breaker_state": self.breaker.state,
+                "breaker_trips": self.breaker.trips,
+                "rejected": dict(self.rejected),
+            }
+
+class _Admission:
+    __slots__ = ("limiter", "started")
+
+    def __init__(self, limiter: ModelLimiter):
+        self.limiter = limiter
+        self.started = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def check_deadline(self):
+        """Raise LLMUnavailable("deadline_exceeded") once the call has run past the limiter's deadline."""
+        if time.monotonic() - self.started > self.limiter.deadline:
+            self.limiter._reject("deadline_exceeded")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.limiter._release(self.started, error=exc_type is not None and exc_type is not GeneratorExit)
+        return False
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from functions.store.sqlite_file import SQLiteFile
+
+# Shared by the Flask app and the summary_gen CLI; override with SUMMARY_CACHE_PATH
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "mlb_summary_cache.sqlite3")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+class SummaryCache(SQLiteFile):
+    """
+    Disk-backed, content-addressed cache of model responses.
+
+    Entries are keyed by a SHA-256 of (model, generation_config, prompt), so a
+    byte-identical request is answered without calling the model. The store is a
+    SQLite file that survives restarts and can be shared by several processes; once
+    the total stored text exceeds max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        super().__init__(path or os.environ.get("SUMMARY_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.max_bytes = max_bytes or int(os.environ.get("SUMMARY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+    @staticmethod
+    def make_key(model: str, generation_config: dict, prompt: str) -> str:
+        """Hash the full request so any change to model, config or prompt is a new entry."""
+        material = json.dumps([model, generation_config, prompt], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)")
+
+    def get(self, key: str):
+        """Return the cached response text for key, or None."""
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT response FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning("Summary cache read failed: %s", e)
+            return None
+
+    def put(self, key: str, model: str, response: str):
+        """Store a response and evict least recently used entries beyond max_bytes."""
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, response, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning("Summary cache write failed: %s", e)
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM summaries ORDER BY accessed_at ASC"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM summaries WHERE key = ?", stale)
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries").fetchone()
+        return {"path": self.path, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+_default_cache = None
+
+def get_summary_cache() -> SummaryCache:
+    """Return the process-wide summary cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SummaryCache()
+    return _default_cache
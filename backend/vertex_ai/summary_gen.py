@@ -1,12 +1,69 @@
+import asyncio
 import json
+import logging
 import os
-import vertexai
-from vertexai.preview.generative_models import GenerativeModel
+from concurrent.futures import ThreadPoolExecutor
+from vertex_ai.llm_client import ensure_initialized, get_model, warm_up, warm_up_in_background
+from vertex_ai.summary_cache import SummaryCache, get_summary_cache
+from vertex_ai.llm_limiter import CircuitBreaker, ModelLimiter
+from functions.metrics.metrics import span, count
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "gemini-1.5-pro-002"
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": 512,
+    "top_p": 0.8
+}
+
+# Ask for both summaries in one call returning JSON (falls back to one call per
+# summary if the reply doesn't parse). Set MLB_COMBINED_SUMMARIES=0 to always use two calls.
+COMBINED_SUMMARIES = os.environ.get("MLB_COMBINED_SUMMARIES", "1") != "0"
+COMBINED_GENERATION_CONFIG = dict(
+    GENERATION_CONFIG,
+    max_output_tokens=1024,
+    response_mime_type="application/json",
+)
+SUMMARY_KEYS = ("detailed_summary", "concise_summary")
+
+# Admission control around every model call: calls refused by the breaker, the rate
+# limit or the in-flight cap, or that miss the deadline, raise LLMUnavailable and the
+# payload is served without summaries. Cached summaries are still served.
+LLM_LIMITER = ModelLimiter(
+    max_in_flight=int(os.environ.get("MLB_LLM_MAX_IN_FLIGHT", "8")),
+    rate=float(os.environ.get("MLB_LLM_RATE", "5")),
+    burst=int(os.environ.get("MLB_LLM_BURST", "10")),
+    deadline=float(os.environ.get("MLB_LLM_DEADLINE", "20")),
+    breaker=CircuitBreaker(
+        window=int(os.environ.get("MLB_LLM_BREAKER_WINDOW", "20")),
+        min_calls=int(os.environ.get("MLB_LLM_BREAKER_MIN_CALLS", "5")),
+        failure_ratio=float(os.environ.get("MLB_LLM_BREAKER_FAILURE_RATIO", "0.5")),
+        slow_call=float(os.environ.get("MLB_LLM_SLOW_CALL", "15")),
+        cooldown=float(os.environ.get("MLB_LLM_BREAKER_COOLDOWN", "30")),
+    ),
+)
+
+# Runs the concise call of the two-call fallback next to the detailed one. Only
+# generate_summaries submits here and its tasks never submit anything, so a caller
+# running on another pool can wait on it without tying up that pool.
+FALLBACK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MLB_SUMMARY_FALLBACK_WORKERS", "8")),
+    thread_name_prefix="summary-fallback",
+)
 
 def initialize_vertex_ai():
-    """Initialize Vertex AI with credentials."""
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.path.join(os.getcwd(), "cred_path")
-    vertexai.init(project="projectId", location="location")
+    """Initialize Vertex AI with credentials (once per process)."""
+    ensure_initialized()
+
+def warm_up_model(background: bool = False):
+    """
+    Initialize Vertex AI and build the summary model before the first request.
+    With background=True this returns right away and the warm-up runs on a thread.
+    """
+    if background:
+        return warm_up_in_background(MODEL_NAME)
+    return warm_up(MODEL_NAME)
 
 def generate_detailed_summary(game_data):
     """
@@ -93,22 +150,240 @@ Compose one punchy sentence that includes:
 """
     return prompt
 
-def generate_game_summary(prompt):
+def generate_combined_summary(game_data):
+    """
+    Build one prompt asking for both summaries as a JSON object, so the shared game
+    context (scores, teams, venue, attendance, key plays) is sent only once.
+    """
+    game_info = game_data.get("game_info", {})
+    detailed_info = game_data.get("detailed_info", {})
+    highlights = game_data.get("highlights", [])
+
+    home_score = game_info.get("teams", {}).get("home", {}).get("score", "N/A")
+    away_score = game_info.get("teams", {}).get("away", {}).get("score", "N/A")
+    winner = game_info.get("result", {}).get("winner", "N/A")
+    loser = game_info.get("result", {}).get("loser", "N/A")
+    away_pitcher = detailed_info.get("away_pitcher", {}).get("fullName", "N/A")
+    home_pitcher = detailed_info.get("home_pitcher", {}).get("fullName", "N/A")
+    venue = detailed_info.get("venue", "N/A")
+    day_night = detailed_info.get("day_night", "N/A")
+    attendance = game_data.get("attendance", "N/A")
+
+    key_play = highlights[0].get("description", "N/A") if highlights else "N/A"
+    sorted_highlights = sorted(highlights, key=lambda x: (x.get('inning', 0), not x.get('isTop', True)))
+    highlights_str = "\n".join([
+        f"- {'Top' if h.get('isTop') else 'Bottom'} {h.get('inning')}: {h.get('description')} (Score: {h.get('score')}, PlayID: {h.get('playId')})"
+        for h in sorted_highlights if h.get('description')
+    ])
+
+    prompt = f"""Write two summaries of this MLB game.
+
+Game Context:
+- Final Score: {winner} {home_score}, {loser} {away_score}
+- Starting Pitchers: {away_pitcher} (Away) vs {home_pitcher} (Home)
+- Venue: {venue} ({day_night} game)
+- Attendance: {attendance}
+- Most Impactful Play: {key_play}
+
+Chronological Key Plays:
+{highlights_str}
+
+Respond with only a JSON object with two string fields:
+- "detailed_summary": two detailed paragraphs separated by a blank line. The first
+  focuses on the game flow and early key plays; the second covers later
+  developments and the final outcome.
+- "concise_summary": one punchy sentence that includes the key offensive play, the
+  final score, and the dominant team's performance.
+"""
+    return prompt
+
+def parse_combined_summary(text):
+    """
+    Parse the reply to a combined prompt. Returns {"detailed_summary": ...,
+    "concise_summary": ...} if it is a JSON object with both fields as non-empty
+    strings, otherwise None.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if text.startswith("```"):
+        # Tolerate a fenced reply (```json ... ```)
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    summaries = {}
+    for key in SUMMARY_KEYS:
+        value = parsed.get(key)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        summaries[key] = value.strip()
+    return summaries
+
+def _cached_reply(prompt, generation_config, use_cache, valid):
+    """Return (cache, cache_key, cached text or None). Cached text that fails valid() counts as a miss."""
+    cache = get_summary_cache() if use_cache else None
+    cache_key = SummaryCache.make_key(MODEL_NAME, generation_config, prompt)
+    if cache is None:
+        return None, cache_key, None
+    cached = cache.get(cache_key)
+    if cached is not None and valid(cached):
+        count("summary_cache_hit")
+        return cache, cache_key, cached
+    count("summary_cache_miss")
+    return cache, cache_key, None
+
+def _generate_text(prompt, generation_config=GENERATION_CONFIG, use_cache=True, valid=bool, wait=0):
+    cache, cache_key, cached = _cached_reply(prompt, generation_config, use_cache, valid)
+    if cached is not None:
+        return cached
+
+    model = get_model(MODEL_NAME)
+    logger.debug("Prompt sent to model:\n%s", prompt)
+    with span("llm_call", model=MODEL_NAME):
+        response = LLM_LIMITER.call(
+            model.generate_content,
+            contents=[prompt],
+            generation_config=generation_config,
+            wait=wait
+        )
+    logger.debug("Model response:\n%s", response.text)
+    if cache is not None and valid(response.text):
+        cache.put(cache_key, MODEL_NAME, response.text)
+    return response.text
+
+async def _generate_text_async(prompt, generation_config=GENERATION_CONFIG, use_cache=True, valid=bool):
+    # The summary cache is SQLite and the first get_model() may wait on the SDK import
+    # in the warm-up thread, so both run on worker threads rather than the event loop
+    loop = asyncio.get_running_loop()
+    cache, cache_key, cached = await loop.run_in_executor(None, _cached_reply, prompt, generation_config,
+                                                          use_cache, valid)
+    if cached is not None:
+        return cached
+
+    model = await loop.run_in_executor(None, get_model, MODEL_NAME)
+    logger.debug("Prompt sent to model:\n%s", prompt)
+    with span("llm_call", model=MODEL_NAME):
+        response = await LLM_LIMITER.call_async(
+            model.generate_content_async,
+            contents=[prompt],
+            generation_config=generation_config
+        )
+    logger.debug("Model response:\n%s", response.text)
+    if cache is not None and valid(response.text):
+        await loop.run_in_executor(None, cache.put, cache_key, MODEL_NAME, response.text)
+    return response.text
+
+def generate_game_summary(prompt, use_cache=True, wait=0):
     """
     Generate game summary content by sending the prompt to Vertex AI.
+    Responses are cached on disk by (model, generation_config, prompt), so an
+    identical prompt is answered from the cache instead of the model. wait is how
+    long to queue for LLM_LIMITER admission before giving up.
     """
-    model = GenerativeModel("gemini-1.5-pro-002")
-    print(f"Prompt sent to model:\n{prompt}\n")  # Debugging line
-    response = model.generate_content(
-        contents=[prompt],
-        generation_config={
-            "temperature": 0.7,
-            "max_output_tokens": 512,
-            "top_p": 0.8
-        }
+    return _generate_text(prompt, use_cache=use_cache, wait=wait)
+
+async def generate_game_summary_async(prompt, use_cache=True):
+    """
+    Async variant of generate_game_summary for the ASGI app. The model call is
+    awaited, so the event loop keeps serving other requests while it runs.
+    """
+    return await _generate_text_async(prompt, use_cache=use_cache)
+
+def _combined_summaries(combined_reply):
+    summaries = parse_combined_summary(combined_reply)
+    if summaries is None:
+        logger.warning("Combined summary reply did not parse, falling back to two calls")
+        count("combined_summary_fallback")
+    return summaries
+
+def generate_summaries(game_data, use_cache=True, parallel=False, wait=0):
+    """
+    Generate both summaries for a game and return {"detailed_summary": ...,
+    "concise_summary": ...}. In combined mode this is one model call; if its reply
+    isn't valid JSON with both fields, the detailed and concise prompts are sent
+    separately (in parallel on FALLBACK_EXECUTOR when parallel=True). Each call
+    queues up to wait seconds for LLM_LIMITER admission.
+    """
+    if COMBINED_SUMMARIES:
+        with span("prompt_build"):
+            prompt = generate_combined_summary(game_data)
+        reply = _generate_text(prompt, COMBINED_GENERATION_CONFIG, use_cache, valid=parse_combined_summary,
+                               wait=wait)
+        summaries = _combined_summaries(reply)
+        if summaries is not None:
+            return summaries
+
+    with span("prompt_build"):
+        detailed_prompt = generate_detailed_summary(game_data)
+        concise_prompt = generate_concise_summary(game_data)
+    if parallel:
+        concise_future = FALLBACK_EXECUTOR.submit(generate_game_summary, concise_prompt, use_cache, wait)
+        detailed_summary = generate_game_summary(detailed_prompt, use_cache, wait)
+        return {"detailed_summary": detailed_summary, "concise_summary": concise_future.result()}
+    return {
+        "detailed_summary": generate_game_summary(detailed_prompt, use_cache, wait),
+        "concise_summary": generate_game_summary(concise_prompt, use_cache, wait),
+    }
+
+async def generate_summaries_async(game_data, use_cache=True):
+    """Async variant of generate_summaries; the fallback calls run concurrently."""
+    if COMBINED_SUMMARIES:
+        with span("prompt_build"):
+            prompt = generate_combined_summary(game_data)
+        reply = await _generate_text_async(prompt, COMBINED_GENERATION_CONFIG, use_cache, valid=parse_combined_summary)
+        summaries = _combined_summaries(reply)
+        if summaries is not None:
+            return summaries
+
+    with span("prompt_build"):
+        detailed_prompt = generate_detailed_summary(game_data)
+        concise_prompt = generate_concise_summary(game_data)
+    detailed_summary, concise_summary = await asyncio.gather(
+        generate_game_summary_async(detailed_prompt, use_cache),
+        generate_game_summary_async(concise_prompt, use_cache),
     )
-    print(f"Model response:\n{response.text}\n")  # Debugging line
-    return response.text
+    return {"detailed_summary": detailed_summary, "concise_summary": concise_summary}
+
+def stream_game_summary(prompt, use_cache=True):
+    """
+    Generate game summary content as a stream of text chunks.
+    A cached response is yielded as a single chunk; otherwise chunks are yielded
+    as the model produces them and the full text is cached once complete. A stream
+    still running at the LLM_LIMITER deadline is abandoned with LLMUnavailable.
+    """
+    cache = get_summary_cache() if use_cache else None
+    cache_key = SummaryCache.make_key(MODEL_NAME, GENERATION_CONFIG, prompt)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            count("summary_cache_hit")
+            yield cached
+            return
+        count("summary_cache_miss")
+
+    model = get_model(MODEL_NAME)
+    parts = []
+    with span("llm_call", model=MODEL_NAME, stream=True), LLM_LIMITER.admit() as admission:
+        responses = model.generate_content(
+            contents=[prompt],
+            generation_config=GENERATION_CONFIG,
+            stream=True
+        )
+        for chunk in responses:
+            admission.check_deadline()
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield text
+    full_text = "".join(parts)
+    if cache is not None and full_text:
+        cache.put(cache_key, MODEL_NAME, full_text)
 
 def main():
     # Get the JSON file path from the user
@@ -121,18 +396,8 @@ def main():
     # Initialize Vertex AI
     initialize_vertex_ai()
 
-    # Generate the detailed game summary
-    detailed_prompt = generate_detailed_summary(game_data)
-    detailed_summary = generate_game_summary(detailed_prompt)
-
-    # Generate the concise game summary
-    concise_prompt = generate_concise_summary(game_data)
-    concise_summary = generate_game_summary(concise_prompt)
-
-    output_data = {
-        "detailed_summary": detailed_summary,
-        "concise_summary": concise_summary
-    }
+    # Generate the detailed and concise game summaries
+    output_data = generate_summaries(game_data)
     
     #output_file_path = r"C:\Users\jmo24\OneDrive\Desktop\Work\MLB\Draft1\outputs\game_summaries.json"
     #with open(output_file_path, 'w') as outfile: